@@ -1,4 +1,3 @@
-from django.apps import apps as django_apps
 from django.conf import settings
 from django.contrib import admin
 from django.urls.base import reverse
@@ -17,6 +16,7 @@ from edc_model_admin.model_admin_next_url_redirect_mixin import \
     ModelAdminNextUrlRedirectError
 
 from .admin_site import pre_flourish_follow_admin
+from .caregiver_locators import latest_locators
 from .exportaction_mixin import ExportActionMixin
 from .forms import (BookingForm, InPersonContactAttemptForm, LogEntryForm, WorkListForm)
 from .models import (PreFlourishBooking, PreFlourishCall,
@@ -239,15 +239,16 @@ class LogEntryAdmin(ModelAdminMixin, admin.ModelAdmin):
             study_maternal_identifier = request.GET.get('study_maternal_identifier')
 
         fields = self.get_all_fields(form)
+        locator_obj = latest_locators.get(study_maternal_identifier)
 
         for idx, field in enumerate(fields):
-            custom_value = self.custom_field_label(study_maternal_identifier, field)
+            custom_value = self.custom_field_label(locator_obj, field)
 
             if custom_value:
                 form.base_fields[
                     field].label = f'{idx + 1}. Why was the contact to {custom_value} ' \
                                    f'unsuccessful?'
-        form.custom_choices = self.phone_choices(study_maternal_identifier)
+        form.custom_choices = self.locator_phone_choices(locator_obj)
         return form
 
     def redirect_url(self, request, obj, post_url_continue=None):
@@ -273,9 +274,7 @@ class LogEntryAdmin(ModelAdminMixin, admin.ModelAdmin):
 
         return redirect_url
 
-    def custom_field_label(self, study_identifier, field):
-        caregiver_locator_cls = django_apps.get_model(
-            'flourish_caregiver.caregiverlocator')
+    def custom_field_label(self, locator_obj, field):
         fields_dict = {
             'cell_contact_fail': 'subject_cell',
             'alt_cell_contact_fail': 'subject_cell_alt',
@@ -287,12 +286,7 @@ class LogEntryAdmin(ModelAdminMixin, admin.ModelAdmin):
             'cell_resp_person_fail': 'caretaker_cell',
             'tel_resp_person_fail': 'caretaker_tel'}
 
-        try:
-            locator_obj = caregiver_locator_cls.objects.filter(
-                study_maternal_identifier=study_identifier).latest('report_datetime')
-        except caregiver_locator_cls.DoesNotExist:
-            pass
-        else:
+        if locator_obj:
             attr_name = fields_dict.get(field, None)
             if attr_name:
                 return getattr(locator_obj, attr_name, '')
@@ -360,32 +354,25 @@ class InPersonContactAttemptAdmin(ModelAdminMixin, admin.ModelAdmin):
             study_maternal_identifier = request.GET.get('study_maternal_identifier')
 
         fields = self.get_all_fields(form)
+        locator_obj = latest_locators.get(study_maternal_identifier)
 
         for idx, field in enumerate(fields):
-            custom_value = self.custom_field_label(study_maternal_identifier,
-                                                   field)
+            custom_value = self.custom_field_label(locator_obj, field)
 
             if custom_value:
                 form.base_fields[field].label = f'{idx + 1}. Why was the in-person ' \
                                                 f'visit' \
                                                 f' to {custom_value} unsuccessful?'
-        form.custom_choices = self.home_visit_choices(study_maternal_identifier)
+        form.custom_choices = self.home_visit_choices(locator_obj)
         return form
 
-    def home_visit_choices(self, study_identifier):
-        caregiver_locator_cls = django_apps.get_model(
-            'flourish_caregiver.caregiverlocator')
+    def home_visit_choices(self, locator_obj):
         field_attrs = [
             'physical_address',
             'subject_work_place',
             'indirect_contact_physical_address']
 
-        try:
-            locator_obj = caregiver_locator_cls.objects.filter(
-                study_maternal_identifier=study_identifier).latest('report_datetime')
-        except caregiver_locator_cls.DoesNotExist:
-            pass
-        else:
+        if locator_obj:
             home_visit_choices = ()
             for field_attr in field_attrs:
                 value = getattr(locator_obj, field_attr)
@@ -393,20 +380,13 @@ class InPersonContactAttemptAdmin(ModelAdminMixin, admin.ModelAdmin):
                     home_visit_choices += ((field_attr, value),)
             return home_visit_choices
 
-    def custom_field_label(self, study_identifier, field):
-        caregiver_locator_cls = django_apps.get_model(
-            'flourish_caregiver.caregiverlocator')
+    def custom_field_label(self, locator_obj, field):
         fields_dict = {
             'phy_addr_unsuc': 'physical_address',
             'workplace_unsuc': 'subject_work_place',
             'contact_person_unsuc': 'indirect_contact_physical_address'}
 
-        try:
-            locator_obj = caregiver_locator_cls.objects.filter(
-                study_maternal_identifier=study_identifier).latest('report_datetime')
-        except caregiver_locator_cls.DoesNotExist:
-            pass
-        else:
+        if locator_obj:
             attr_name = fields_dict.get(field, None)
             if attr_name:
                 return getattr(locator_obj, attr_name, '')
@@ -1,3 +1,6 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.apps import AppConfig as DjangoAppConfig
 from django.conf import settings
 
@@ -8,6 +11,23 @@ class AppConfig(DjangoAppConfig):
     admin_site_name = 'pre_flourish_follow_admin'
     extra_assignee_choices = ()
     assignable_users_group = 'assignable users'
+    child_age_limit = Decimal('17.9')
+    # Threads running queued exports, 0 leaves them to `run_export_jobs`.
+    export_job_workers = 2
+    # Seconds without a heartbeat before `run_export_jobs` requeues a running
+    # export, running exports refresh it every `export_job_heartbeat_interval`.
+    export_job_stale_timeout = 1800
+    export_job_heartbeat_interval = 60
+    # Calls reports snapshots are refreshed from scratch at least this often.
+    calls_reports_full_refresh_interval = timedelta(hours=24)
+    # Latest caregiver locator cache, see caregiver_locators.LatestLocators.
+    locator_cache_size = 2048
+    locator_local_timeout = 60
+    locator_cache_alias = None
+    locator_cache_timeout = 300
+    # Per request query and timing profile, see instrumentation.py.
+    instrumentation_enabled = False
+    instrumentation_footer = True
 
     def ready(self):
         from .models import cal_log_entry_on_post_save
@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.apps import apps as django_apps
+from django.core.cache import caches
+
+
+class LatestLocators:
+
+    """Resolves the latest caregiver locator per study maternal identifier,
+    or per subject identifier.
+
+    Lookups go to a process-local LRU, then to the Django cache named by
+    `AppConfig.locator_cache_alias` if set, then to the database. Entries
+    are invalidated on locator post_save; local entries also expire after
+    `AppConfig.locator_local_timeout` seconds since other processes can not
+    clear them.
+
+    The local LRU keeps the field values and each caller gets its own
+    locator instance built from them. The shared cache only keeps the
+    locator pk, so the decrypted contact details never leave the process.
+    """
+
+    locator_model = 'flourish_caregiver.caregiverlocator'
+    cache_key_prefix = 'pre_flourish_follow_latest_locator'
+    missing = 'missing'
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def app_config(self):
+        return django_apps.get_app_config('pre_flourish_follow')
+
+    @property
+    def locator_cls(self):
+        return django_apps.get_model(self.locator_model)
+
+    @property
+    def shared_cache(self):
+        alias = self.app_config.locator_cache_alias
+        return caches[alias] if alias else None
+
+    def cache_key(self, identifier, field='study_maternal_identifier'):
+        return f'{self.cache_key_prefix}_{field}_{identifier}'
+
+    def get(self, identifier, field='study_maternal_identifier'):
+        """Returns the latest locator or None.
+        """
+        if not identifier:
+            return None
+        return self.get_many([identifier], field=field).get(identifier)
+
+    def get_many(self, identifiers, field='study_maternal_identifier'):
+        """Returns a dict of the latest locator per identifier, querying
+        the database once for all misses.
+        """
+        identifiers = set(filter(None, identifiers))
+        found = {}
+        for identifier in identifiers:
+            value = self._get_local((field, identifier))
+            if value is not None:
+                found[identifier] = value
+
+        misses = identifiers - set(found)
+        shared_cache = self.shared_cache
+        if misses and shared_cache:
+            cached = shared_cache.get_many([self.cache_key(idx, field) for idx in misses])
+            pks = {idx: cached.get(self.cache_key(idx, field)) for idx in misses}
+            locators = {
+                str(locator.pk): locator
+                for locator in self.locator_cls.objects.filter(pk__in=[
+                    pk for pk in pks.values() if pk not in [None, self.missing]])}
+            for identifier, pk in pks.items():
+                if pk == self.missing:
+                    found[identifier] = self.missing
+                elif pk in locators:
+                    found[identifier] = self.locator_values(locators[pk])
+                else:
+                    continue
+                self._set_local((field, identifier), found[identifier])
+            misses -= set(found)
+
+        if misses:
+            loaded = dict.fromkeys(misses, self.missing)
+            locators = self.locator_cls.objects.filter(
+                **{f'{field}__in': misses}).order_by('report_datetime')
+            for locator in locators:
+                loaded[getattr(locator, field)] = locator
+            found.update(self.prime(loaded, field=field))
+
+        return {identifier: self.locator_from_values(value)
+                for identifier, value in found.items() if value != self.missing}
+
+    def prime(self, locators, field='study_maternal_identifier'):
+        """Stores locators already loaded elsewhere, keyed by identifier,
+        and returns their values.
+        """
+        values = {
+            identifier: (locator if locator == self.missing
+                         else self.locator_values(locator))
+            for identifier, locator in locators.items()}
+        for identifier, value in values.items():
+            self._set_local((field, identifier), value)
+        shared_cache = self.shared_cache
+        if shared_cache:
+            shared_cache.set_many(
+                {self.cache_key(idx, field): (
+                    locator if locator == self.missing else str(locator.pk))
+                 for idx, locator in locators.items()},
+                self.app_config.locator_cache_timeout)
+        return values
+
+    def locator_values(self, locator):
+        return {field.attname: getattr(locator, field.attname)
+                for field in self.locator_cls._meta.concrete_fields}
+
+    def locator_from_values(self, values):
+        return self.locator_cls.from_db(
+            self.locator_cls.objects.db, list(values), list(values.values()))
+
+    def invalidate(self, identifier, field='study_maternal_identifier'):
+        with self._lock:
+            self._local.pop((field, identifier), None)
+        shared_cache = self.shared_cache
+        if shared_cache:
+            shared_cache.delete(self.cache_key(identifier, field))
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+    def _get_local(self, identifier):
+        with self._lock:
+            entry = self._local.get(identifier)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._local[identifier]
+                return None
+            self._local.move_to_end(identifier)
+            return value
+
+    def _set_local(self, identifier, value):
+        expires = time.monotonic() + self.app_config.locator_local_timeout
+        with self._lock:
+            self._local[identifier] = (expires, value)
+            self._local.move_to_end(identifier)
+            while len(self._local) > self.app_config.locator_cache_size:
+                self._local.popitem(last=False)
+
+
+latest_locators = LatestLocators()
@@ -44,6 +44,13 @@ CONTACT_FAIL_REASON = (
     (NOT_APPLICABLE, 'Not Applicable'),
 )
 
+EXPORT_STATUS = (
+    ('pending', 'Pending'),
+    ('running', 'Running'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+)
+
 LOCATION_FOR_CONTACT = (
     ('physical_address', 'Physical Address with detailed description'),
     ('subject_work_place', 'Name and location of workplace'),
@@ -0,0 +1,151 @@
+import datetime
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.apps import apps as django_apps
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from edc_base.utils import get_utcnow
+
+logger = logging.getLogger(__name__)
+
+export_file_model = 'pre_flourish_follow.preflourishfollowexportfile'
+
+# The views allowed to build queued exports, per report type.
+export_views = {
+    'participants_assignment':
+        'pre_flourish_follow.views.home_view.HomeView',
+    'appointments_window_periods':
+        'pre_flourish_follow.views.appointments_windows_listboard.AppointmentListboardView',
+}
+
+_executor = None
+
+
+def get_executor():
+    """Returns the process-local export worker pool, or None if the
+    app config disables it and jobs are left to `run_export_jobs`.
+    """
+    global _executor
+    app_config = django_apps.get_app_config('pre_flourish_follow')
+    if not app_config.export_job_workers:
+        return None
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=app_config.export_job_workers,
+            thread_name_prefix='pre_flourish_follow_export')
+    return _executor
+
+
+def get_export_view_cls(report_type):
+    """Returns the view class registered to build the report type's
+    exports.
+    """
+    try:
+        return import_string(export_views[report_type])
+    except KeyError:
+        raise ValueError(f'No export view registered for report type {report_type}.')
+
+
+def submit_export_job(pk):
+    """Hands a pending export job to the worker pool once the
+    transaction creating it commits.
+    """
+    executor = get_executor()
+    if executor:
+        transaction.on_commit(lambda: executor.submit(_run_pooled_export_job, pk))
+
+
+def _run_pooled_export_job(pk):
+    try:
+        run_export_job(pk)
+    finally:
+        connections.close_all()
+
+
+@contextmanager
+def heartbeat(pk):
+    """Refreshes the running job's heartbeat from a background thread
+    every `export_job_heartbeat_interval` seconds while the block runs,
+    so a long build is not requeued as stale while its worker is alive.
+    """
+    app_config = django_apps.get_app_config('pre_flourish_follow')
+    export_file_cls = django_apps.get_model(export_file_model)
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(app_config.export_job_heartbeat_interval):
+                export_file_cls.objects.filter(pk=pk, status='running').update(
+                    heartbeat=get_utcnow())
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(
+        target=beat, name=f'pre_flourish_follow_export_heartbeat_{pk}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_export_job(pk):
+    """Claims a pending export job and builds its file with the view
+    registered for its report type. Returns True if the job was
+    claimed.
+    """
+    export_file_cls = django_apps.get_model(export_file_model)
+    claimed = export_file_cls.objects.filter(pk=pk, status='pending').update(
+        status='running', progress=0, rows_written=0, heartbeat=get_utcnow())
+    if not claimed:
+        return False
+
+    def progress(percent=None, rows=None):
+        options = {'heartbeat': get_utcnow()}
+        if percent is not None:
+            options.update(progress=int(percent))
+        if rows is not None:
+            options.update(rows_written=rows)
+        export_file_cls.objects.filter(pk=pk).update(**options)
+
+    try:
+        export_file = export_file_cls.objects.get(pk=pk)
+        view = get_export_view_cls(export_file.report_type)()
+        with heartbeat(pk):
+            view.build_export(export_file, export_file.export_params, progress=progress)
+    except Exception as e:
+        logger.exception(f'Export job {pk} failed.')
+        export_file_cls.objects.filter(pk=pk).update(
+            status='failed', error=f'The export failed ({type(e).__name__}).')
+    return True
+
+
+def requeue_stale_export_jobs():
+    """Returns running jobs without a heartbeat within the app config's
+    `export_job_stale_timeout` to pending, i.e. whose worker died, and
+    returns the number requeued.
+    """
+    app_config = django_apps.get_app_config('pre_flourish_follow')
+    export_file_cls = django_apps.get_model(export_file_model)
+    stale_datetime = get_utcnow() - datetime.timedelta(
+        seconds=app_config.export_job_stale_timeout)
+    return export_file_cls.objects.filter(
+        Q(heartbeat__lt=stale_datetime) | Q(heartbeat__isnull=True),
+        status='running').update(
+        status='pending', progress=0, rows_written=0)
+
+
+def run_pending_export_jobs():
+    """Requeues stale jobs then runs the pending export jobs, oldest
+    first, and returns the number run.
+    """
+    export_file_cls = django_apps.get_model(export_file_model)
+    requeue_stale_export_jobs()
+    pks = export_file_cls.objects.filter(status='pending').order_by(
+        'created').values_list('pk', flat=True)
+    return len([pk for pk in list(pks) if run_export_job(pk)])
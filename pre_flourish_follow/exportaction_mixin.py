@@ -1,55 +1,167 @@
+import csv
+import json
+
 from django.apps import apps as django_apps
-from django.db.models import ForeignKey, ManyToManyField, ManyToOneRel, OneToOneField
+from django.db.models import (ForeignKey, ManyToManyField, ManyToOneRel, OneToOneField,
+                              prefetch_related_objects)
+from django.http import StreamingHttpResponse
 from django.utils.translation import ugettext_lazy as _
 
 from flourish_export.admin_export_helper import AdminExportHelper
 
+from .caregiver_locators import latest_locators
+
+
+class Echo:
+    """An object that implements just the write method of the file-like
+    interface, for streaming csv rows.
+    """
+
+    def write(self, value):
+        return value
+
 
 class ExportActionMixin(AdminExportHelper):
 
-    def export_as_csv(self, request, queryset):
+    export_chunk_size = 500
 
-        records = []
-
-        for obj in queryset:
-            data = obj.__dict__.copy()
-            study_maternal_identifier = getattr(obj, 'study_maternal_identifier', None)
-            for field in self.get_model_fields:
-                if isinstance(field, ManyToManyField):
-                    data.update(self.m2m_data_dict(obj, field))
-                    continue
-                if isinstance(field, (ForeignKey, OneToOneField,)):
-                    continue
-                if isinstance(field, ManyToOneRel):
-                    data.update(self.inline_data_dict(obj, field))
-                    continue
-                if field.choices:
-                    data[field.name] = getattr(obj, f'get_{field.name}_display')()
-                    phone_fields = ['phone_num_type', 'phone_num_success']
-                    if field.name in phone_fields:
-                        numbers = self.phone_choices(study_maternal_identifier)
-                        selected_numbers = []
-                        if numbers:
-                            for number in numbers:
-                                selected_numbers.append(number[1])
-                        data[field.name] = ', '.join(selected_numbers)
-
-            locator_obj = self.locator_obj(study_maternal_identifier)
-            if locator_obj:
-                data['screening_identifier'] = locator_obj.screening_identifier
-                data['subject_identifier'] = locator_obj.subject_identifier
-
-            data = self.remove_exclude_fields(data)
-            data = self.fix_date_formats(data)
-            records.append(data)
+    # Columns added from the participant's latest caregiver locator.
+    locator_columns = ['screening_identifier', 'subject_identifier']
 
+    def export_as_csv(self, request, queryset):
+        records = list(self.export_records(queryset))
         response = self.write_to_excel(records)
         return response
 
     export_as_csv.short_description = _(
         'Export selected %(verbose_name_plural)s')
 
-    actions = [export_as_csv]
+    def export_as_streaming_csv(self, request, queryset):
+        """Streams the export as csv, writing rows as each chunk of the
+        queryset is read so memory stays flat for large exports.
+        """
+        response = StreamingHttpResponse(
+            self.stream_csv_rows(queryset), content_type='text/csv')
+        response['Content-Disposition'] = (
+            f'attachment; filename={self.model._meta.model_name}.csv')
+        return response
+
+    export_as_streaming_csv.short_description = _(
+        'Export selected %(verbose_name_plural)s (streaming csv)')
+
+    actions = [export_as_csv, export_as_streaming_csv]
+
+    def stream_csv_rows(self, queryset):
+        writer = csv.DictWriter(
+            Echo(), fieldnames=self.export_fieldnames(), restval='',
+            extrasaction='ignore')
+        yield writer.writeheader()
+        for record in self.export_records(queryset, related_columns=True):
+            yield writer.writerow(record)
+
+    def export_fieldnames(self):
+        """Returns the streaming export's columns, known before the
+        first row is read: the model's fields, a column per many to many
+        field and inline and the locator columns.
+        """
+        fieldnames = {}
+        for field in self.get_model_fields:
+            if isinstance(field, (ManyToManyField, ManyToOneRel)):
+                fieldnames[field.name] = ''
+            elif getattr(field, 'concrete', False):
+                fieldnames[field.attname] = ''
+        fieldnames.update(dict.fromkeys(self.locator_columns, ''))
+        return list(self.remove_exclude_fields(fieldnames))
+
+    @staticmethod
+    def related_column(values):
+        """Returns the m2m or inline values for a single column, as is
+        if there is one value, otherwise as json.
+        """
+        if not values:
+            return ''
+        if len(values) == 1:
+            return next(iter(values.values()))
+        return json.dumps(values, default=str)
+
+    @property
+    def export_prefetch_lookups(self):
+        """Returns the m2m and inline relations read for each exported
+        object, prefetched per chunk.
+        """
+        lookups = []
+        for field in self.get_model_fields:
+            if isinstance(field, ManyToManyField):
+                lookups.append(field.name)
+            elif isinstance(field, ManyToOneRel):
+                lookups.append(field.get_accessor_name())
+        return lookups
+
+    def export_records(self, queryset, related_columns=False):
+        """Yields an export record per object, iterating the queryset in
+        chunks and loading the latest locators and the m2m and inline
+        relations once per chunk.
+        """
+        chunk = []
+        for obj in queryset.iterator(chunk_size=self.export_chunk_size):
+            chunk.append(obj)
+            if len(chunk) == self.export_chunk_size:
+                yield from self.export_chunk_records(chunk, related_columns)
+                chunk = []
+        if chunk:
+            yield from self.export_chunk_records(chunk, related_columns)
+
+    def export_chunk_records(self, objs, related_columns=False):
+        prefetch_related_objects(objs, *self.export_prefetch_lookups)
+        locators = self.locator_objs(
+            [getattr(obj, 'study_maternal_identifier', None) for obj in objs])
+        for obj in objs:
+            yield self.export_record(
+                obj, locators.get(getattr(obj, 'study_maternal_identifier', None)),
+                related_columns=related_columns)
+
+    def export_record(self, obj, locator_obj=None, related_columns=False):
+        """Returns the export record for the object. With
+        `related_columns` each m2m field and inline is a single column,
+        for exports with fixed columns.
+        """
+        data = obj.__dict__.copy()
+        data.pop('_prefetched_objects_cache', None)
+        for field in self.get_model_fields:
+            if isinstance(field, ManyToManyField):
+                values = self.m2m_data_dict(obj, field)
+                if related_columns:
+                    data[field.name] = self.related_column(values)
+                else:
+                    data.update(values)
+                continue
+            if isinstance(field, (ForeignKey, OneToOneField,)):
+                continue
+            if isinstance(field, ManyToOneRel):
+                values = self.inline_data_dict(obj, field)
+                if related_columns:
+                    data[field.name] = self.related_column(values)
+                else:
+                    data.update(values)
+                continue
+            if field.choices:
+                data[field.name] = getattr(obj, f'get_{field.name}_display')()
+                phone_fields = ['phone_num_type', 'phone_num_success']
+                if field.name in phone_fields:
+                    numbers = self.locator_phone_choices(locator_obj)
+                    selected_numbers = []
+                    if numbers:
+                        for number in numbers:
+                            selected_numbers.append(number[1])
+                    data[field.name] = ', '.join(selected_numbers)
+
+        if locator_obj:
+            data['screening_identifier'] = locator_obj.screening_identifier
+            data['subject_identifier'] = locator_obj.subject_identifier
+
+        data = self.remove_exclude_fields(data)
+        data = self.fix_date_formats(data)
+        return data
 
     def previous_bhp_study(self, study_maternal_identifier=None):
         dataset_cls = django_apps.get_model('flourish_caregiver.maternaldataset')
@@ -63,19 +175,18 @@ class ExportActionMixin(AdminExportHelper):
                 return dataset_obj.protocol
 
     def locator_obj(self, study_identifier):
-        caregiver_locator_cls = django_apps.get_model(
-            'flourish_caregiver.caregiverlocator')
-        try:
-            locator_obj = caregiver_locator_cls.objects.filter(
-                study_maternal_identifier=study_identifier).latest('report_datetime')
-        except caregiver_locator_cls.DoesNotExist:
-            return None
-        else:
-            return locator_obj
+        return latest_locators.get(study_identifier)
+
+    def locator_objs(self, study_identifiers):
+        """Returns the latest locator per study maternal identifier,
+        loading the uncached ones in one query.
+        """
+        return latest_locators.get_many(study_identifiers)
 
     def phone_choices(self, study_identifier):
-        caregiver_locator_cls = django_apps.get_model(
-            'flourish_caregiver.caregiverlocator')
+        return self.locator_phone_choices(self.locator_obj(study_identifier))
+
+    def locator_phone_choices(self, locator_obj):
         field_attrs = [
             'subject_cell',
             'subject_cell_alt',
@@ -87,8 +198,6 @@ class ExportActionMixin(AdminExportHelper):
             'caretaker_cell',
             'caretaker_tel']
 
-        locator_obj = self.locator_obj(study_identifier)
-
         if locator_obj:
             phone_choices = ()
             for field_attr in field_attrs:
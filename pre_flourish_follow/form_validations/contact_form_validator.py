@@ -1,3 +1,4 @@
+from django.apps import apps as django_apps
 from django.core.exceptions import ValidationError
 from edc_constants.constants import NOT_APPLICABLE
 
@@ -25,15 +26,22 @@ class ContactFormValidator:
                 self._errors.update(msg)
                 raise ValidationError(msg)
 
+    @property
+    def caregiver_locator_cls(self):
+        return django_apps.get_model('flourish_caregiver.caregiverlocator')
+
     def caregiver_locator(self, study_maternal_identifier):
-        try:
-            locator = self.caregiver_locator_cls.objects.get(
-                study_maternal_identifier=study_maternal_identifier)
-        except self.caregiver_locator_cls.DoesNotExist:
+        """Returns the latest locator, read from the database rather
+        than the locator cache so the form validates against current
+        contacts.
+        """
+        locator = self.caregiver_locator_cls.objects.filter(
+            study_maternal_identifier=study_maternal_identifier).order_by(
+                'report_datetime').last()
+        if not locator:
             raise ValidationError(
                 f'Caregiver locator for {study_maternal_identifier} does not exist.')
-        else:
-            return locator
+        return locator
 
     def validate_unsuccesful_na(self, fields_map, contact_used, contact_success):
         cleaned_data = self.cleaned_data
@@ -1,4 +1,3 @@
-from django.apps import apps as django_apps
 from edc_constants.constants import NO, YES, CLOSED, OTHER
 from edc_form_validators import FormValidator
 
@@ -8,10 +7,6 @@ from django.core.exceptions import ValidationError
 
 class LogEntryFormValidator(ContactFormValidator, FormValidator):
 
-    @property
-    def caregiver_locator_cls(self):
-        return django_apps.get_model('flourish_caregiver.caregiverlocator')
-
     def clean(self):
         cleaned_data = self.cleaned_data
         study_maternal_identifier = cleaned_data.get('study_maternal_identifier')
@@ -0,0 +1,164 @@
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.apps import apps as django_apps
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class RequestProfile:
+
+    """Query count, SQL time and wall time for a request and for each
+    named section run while handling it.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.queries = 0
+        self.sql_time = 0.0
+        self.started = time.perf_counter()
+        self.wall_time = None
+        self.sections = {}
+
+    def record_query(self, execute, sql, params, many, context):
+        """A database execute wrapper counting the query and its time.
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_time += time.perf_counter() - started
+
+    def add_section(self, name, queries, sql_time, wall_time):
+        section = self.sections.setdefault(
+            name, {'calls': 0, 'queries': 0, 'sql_time': 0.0, 'wall_time': 0.0})
+        section['calls'] += 1
+        section['queries'] += queries
+        section['sql_time'] += sql_time
+        section['wall_time'] += wall_time
+
+    def finish(self):
+        self.wall_time = time.perf_counter() - self.started
+
+    def as_dict(self):
+        """Returns the profile with times in milliseconds, sections by
+        descending SQL time. Wall time runs to now until finished.
+        """
+        wall_time = self.wall_time
+        if wall_time is None:
+            wall_time = time.perf_counter() - self.started
+        sections = sorted(
+            self.sections.items(), key=lambda item: item[1]['sql_time'], reverse=True)
+        return {
+            'path': self.path,
+            'queries': self.queries,
+            'sql_ms': round(self.sql_time * 1000, 2),
+            'wall_ms': round(wall_time * 1000, 2),
+            'sections': [
+                {'name': name,
+                 'calls': section['calls'],
+                 'queries': section['queries'],
+                 'sql_ms': round(section['sql_time'] * 1000, 2),
+                 'wall_ms': round(section['wall_time'] * 1000, 2)}
+                for name, section in sections]}
+
+
+def current_profile():
+    return getattr(_local, 'profile', None)
+
+
+@contextmanager
+def profiling(path=None):
+    """Profiles the queries run on all connections in this thread,
+    yielding the RequestProfile.
+    """
+    profile = RequestProfile(path=path)
+    previous = current_profile()
+    _local.profile = profile
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.record_query))
+            yield profile
+    finally:
+        profile.finish()
+        _local.profile = previous
+
+
+@contextmanager
+def section(name):
+    """Records the queries, SQL time and wall time of the block under
+    `name`, if a profile is running. Nested sections are each charged
+    for their inner sections.
+    """
+    profile = current_profile()
+    if profile is None:
+        yield
+        return
+    queries, sql_time = profile.queries, profile.sql_time
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_section(
+            name,
+            profile.queries - queries,
+            profile.sql_time - sql_time,
+            time.perf_counter() - started)
+
+
+def instrumented(func=None, name=None):
+    """Decorates a function or property getter to run as a section,
+    named after its qualified name by default.
+
+        @property
+        @instrumented
+        def subject_locator(self):
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name)
+    section_name = name or func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if current_profile() is None:
+            return func(*args, **kwargs)
+        with section(section_name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class InstrumentationMiddleware:
+
+    """Profiles each request when the app config's
+    `instrumentation_enabled` is set, logging the profile as JSON and
+    setting it on the request as `instrumentation` for staff users, for
+    the footer on the pre_flourish_follow templates.
+
+    When disabled the middleware removes itself at start up.
+    """
+
+    def __init__(self, get_response):
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        if not app_config.instrumentation_enabled:
+            raise MiddlewareNotUsed
+        self.show_footer = app_config.instrumentation_footer
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profiling(path=request.path) as profile:
+            user = getattr(request, 'user', None)
+            if self.show_footer and user is not None and user.is_staff:
+                request.instrumentation = profile
+            response = self.get_response(request)
+        logger.info(json.dumps(profile.as_dict()))
+        return response
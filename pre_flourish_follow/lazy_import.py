@@ -0,0 +1,27 @@
+import importlib
+
+
+class LazyModule:
+
+    """A module proxy that imports the module on first attribute
+    access, deferring heavy dependencies such as pandas until a report
+    or export needs them.
+
+        pd = LazyModule('pandas')
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        if self._module is None:
+            self.__dict__['_module'] = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f'<LazyModule {self._name} ({state})>'
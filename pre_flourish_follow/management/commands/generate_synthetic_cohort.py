@@ -0,0 +1,84 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from ...synthetic_cohort import SyntheticCohort
+
+
+class Command(BaseCommand):
+
+    help = ('Generate a deterministic synthetic pre flourish cohort with bulk '
+            'inserts, for load and scale testing. Never run against production.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=1000,
+            help='Number of participants to generate, e.g. 1000 to 500000.')
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=2023,
+            help='The same seed and size always generate the same cohort.')
+        parser.add_argument(
+            '--start',
+            type=int,
+            default=0,
+            help='Index of the first participant, to grow an existing cohort.')
+        parser.add_argument(
+            '--reference-date',
+            default=SyntheticCohort.default_reference_datetime.date().isoformat(),
+            help=('Date the call dates, appointments and statuses are generated '
+                  'relative to, YYYY-MM-DD. Keep it fixed to regenerate a cohort.'))
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000)
+        parser.add_argument(
+            '--no-stand-ins',
+            action='store_true',
+            help=('Do not create the caregiver locator and maternal dataset '
+                  'rows, e.g. if flourish_caregiver is already populated.'))
+        parser.add_argument(
+            '--no-appointments',
+            action='store_true',
+            help='Do not create appointments for the enrolled participants.')
+        parser.add_argument(
+            '--i-know-this-is-not-production',
+            action='store_true',
+            dest='not_production',
+            help='Allow running with DEBUG off.')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['not_production']:
+            raise CommandError(
+                'Refusing to write synthetic participants with DEBUG off, pass '
+                '--i-know-this-is-not-production if this is not a production database.')
+        if options['size'] < 1:
+            raise CommandError('--size must be a positive number.')
+        try:
+            reference_date = datetime.date.fromisoformat(options['reference_date'])
+        except ValueError:
+            raise CommandError('--reference-date must be a date, YYYY-MM-DD.')
+        cohort = SyntheticCohort(
+            size=options['size'],
+            seed=options['seed'],
+            start=options['start'],
+            batch_size=options['batch_size'],
+            stand_ins=not options['no_stand_ins'],
+            appointments=not options['no_appointments'],
+            reference_datetime=datetime.datetime.combine(
+                reference_date, SyntheticCohort.default_reference_datetime.timetz()),
+            progress=self.progress)
+        with transaction.atomic():
+            counts = cohort.generate()
+        for label, count in counts.items():
+            self.stdout.write(f'{label}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["size"]} synthetic participants generated.'))
+
+    def progress(self, generated, size):
+        self.stdout.write(f'{generated} of {size} participants generated.')
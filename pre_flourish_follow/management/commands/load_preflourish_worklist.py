@@ -0,0 +1,65 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...worklist_loader import WorkListLoader
+
+
+class Command(BaseCommand):
+
+    help = ('Load participants into the pre flourish worklist with bulk inserts, '
+            'from a csv file or the flourish caregiver maternal dataset.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--csv',
+            dest='csv_path',
+            help=('Csv file with a study_maternal_identifier and prev_study column, '
+                  'and optionally subject_identifier. Defaults to the maternal dataset.'))
+        parser.add_argument(
+            '--username',
+            required=True,
+            help=('Existing username recorded as user_created on the loaded rows, '
+                  'added to the assignable users group.'))
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000)
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the participants that would be loaded without writing.')
+
+    def handle(self, *args, **options):
+        self.totals = {'loaded': 0, 'existing': 0}
+        loader = WorkListLoader(
+            username=options['username'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            progress=self.progress)
+
+        if options['csv_path']:
+            try:
+                with open(options['csv_path'], newline='') as f:
+                    reader = csv.DictReader(f)
+                    if 'study_maternal_identifier' not in (reader.fieldnames or []):
+                        raise CommandError(
+                            'The csv file must have a study_maternal_identifier column.')
+                    loaded = loader.load(reader)
+            except FileNotFoundError:
+                raise CommandError(f'File {options["csv_path"]} does not exist.')
+        else:
+            loaded = loader.load(loader.maternal_dataset_rows())
+        loader.finish()
+
+        action = 'would be loaded' if options['dry_run'] else 'loaded'
+        self.stdout.write(self.style.SUCCESS(
+            f'{loaded} participants {action}, '
+            f'{self.totals["existing"]} already on the worklist.'))
+
+    def progress(self, loaded, existing):
+        self.totals['loaded'] += loaded
+        self.totals['existing'] += existing
+        self.stdout.write(
+            f'{self.totals["loaded"]} participants processed, '
+            f'{self.totals["existing"]} already on the worklist.')
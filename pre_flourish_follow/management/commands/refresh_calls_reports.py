@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from ...views import CallsReports
+
+
+class Command(BaseCommand):
+
+    help = ('Refresh the calls reports snapshot, re-evaluating only the '
+            'participants modified since the latest snapshot.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Recompute the reports for all participants.')
+
+    def handle(self, *args, **options):
+        snapshot = CallsReports().refresh_snapshot(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Calls reports snapshot {snapshot.snapshot_datetime} created: '
+            f'{len(snapshot.eligibility_rows)} called participants, '
+            f'{len(snapshot.enrolment_rows)} child consents.'))
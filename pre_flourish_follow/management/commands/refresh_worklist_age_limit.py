@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from ...models import PreFlourishWorkList
+
+
+class Command(BaseCommand):
+
+    help = ('Flag the pre flourish worklist records whose child has reached '
+            'the age limit, excluding them from participant allocation.')
+
+    def handle(self, *args, **options):
+        flagged, cleared = PreFlourishWorkList.objects.refresh_over_age_limit()
+        self.stdout.write(self.style.SUCCESS(
+            f'{flagged} worklist records flagged over the age limit, '
+            f'{cleared} cleared.'))
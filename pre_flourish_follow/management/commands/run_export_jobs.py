@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...export_jobs import run_pending_export_jobs
+
+
+class Command(BaseCommand):
+
+    help = 'Run the pending pre flourish follow export jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for pending export jobs.')
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=10,
+            help='Seconds between polls when looping.')
+
+    def handle(self, *args, **options):
+        while True:
+            count = run_pending_export_jobs()
+            if count:
+                self.stdout.write(self.style.SUCCESS(
+                    f'{count} export jobs run.'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
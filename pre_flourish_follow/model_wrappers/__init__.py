@@ -1,4 +1,5 @@
 from .in_person_contact_attempt_model_wrapper import InPersonContactAttemptModelWrapper
 from .worklist_model_wrapper import WorkListModelWrapper
+from .worklist_prefetch import WorkListPrefetch
 from .follow_appointment_model_wrapper import FollowAppointmentModelWrapper
 from .booking_model_wrapper import BookingModelWrapper
@@ -5,7 +5,10 @@ from .consent_model_wrapper_mixin import ConsentModelWrapperMixin
 from dateutil.relativedelta import relativedelta
 from django.utils import timezone
 
-class FollowAppointmentModelWrapper(ModelWrapper):
+from .memoized_property import MemoizedPropertiesMixin, memoized_property
+
+
+class FollowAppointmentModelWrapper(MemoizedPropertiesMixin, ModelWrapper):
     model = 'edc_appointment.appointment'
     querystring_attrs = ['subject_identifier']
     next_url_attrs = ['study_maternal_identifier']
@@ -18,27 +21,34 @@ class FollowAppointmentModelWrapper(ModelWrapper):
         """
         return self.object.timepoint_datetime
 
+    @memoized_property
+    def visit_definition(self):
+        """Returns the appointment's visit from the schedule, or None.
+        """
+        try:
+            return self.object.visits.get(self.object.visit_code)
+        except:
+            return None
+
     @property
     def earliest_date_due(self):
         """Returns the earlist date to see a participant.
         """
-        try:
-            visit_definition = self.object.visits.get(self.object.visit_code)
-        except:
+        if hasattr(self.object, 'earliest_due_date'):
+            return self.object.earliest_due_date or 'N/A'
+        if not self.visit_definition:
             return "N/A"
-        else:
-            return self.ideal_date_due - visit_definition.rlower
+        return self.ideal_date_due - self.visit_definition.rlower
 
     @property
     def latest_date_due(self):
         """Returns the last date to see a participant.
         """
-        try:
-            visit_definition = self.object.visits.get(self.object.visit_code)
-        except:
+        if hasattr(self.object, 'latest_due_date'):
+            return self.object.latest_due_date or 'N/A'
+        if not self.visit_definition:
             return "N/A"
-        else:
-            return self.ideal_date_due + visit_definition.rlower
+        return self.ideal_date_due + self.visit_definition.rupper
     
     @property
     def days_count_down(self):
@@ -2,8 +2,10 @@ from django.apps import apps as django_apps
 from django.conf import settings
 from edc_model_wrapper import ModelWrapper
 
+from .memoized_property import MemoizedPropertiesMixin, memoized_property
 
-class LogEntryModelWrapper(ModelWrapper):
+
+class LogEntryModelWrapper(MemoizedPropertiesMixin, ModelWrapper):
     model = 'pre_flourish_follow.preflourishlogentry'
     querystring_attrs = ['log', 'study_maternal_identifier', 'prev_study']
     next_url_attrs = ['log', 'study_maternal_identifier', 'prev_study']
@@ -13,7 +15,7 @@ class LogEntryModelWrapper(ModelWrapper):
     def log(self):
         return self.object.log
 
-    @property
+    @memoized_property
     def prev_study(self):
         pre_flourish_worklist_cls = django_apps.get_model(
             'pre_flourish_follow.preflourishworklist')
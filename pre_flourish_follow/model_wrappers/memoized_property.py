@@ -0,0 +1,69 @@
+class memoized_property(property):
+
+    """A read only property computed once per wrapper instance, until
+    invalidated with `MemoizedPropertiesMixin.invalidate`.
+
+    Unlike cached_property it stays a data descriptor, so the model
+    wrapper setting an object's field of the same name, e.g.
+    `prev_study`, does not replace it.
+
+    Properties computed from other memoized properties declare them, so
+    invalidating those also clears this one:
+
+        @memoized_property.depends_on('latest_call')
+        def call(self):
+    """
+
+    def __init__(self, fget, depends_on=()):
+        super().__init__(fget)
+        self.name = fget.__name__
+        self.__doc__ = fget.__doc__
+        self.dependencies = tuple(depends_on)
+
+    @classmethod
+    def depends_on(cls, *names):
+        return lambda fget: cls(fget, depends_on=names)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        memo = instance.__dict__.setdefault('_memoized', {})
+        try:
+            return memo[self.name]
+        except KeyError:
+            value = memo[self.name] = self.fget(instance)
+            return value
+
+
+class MemoizedPropertiesMixin:
+
+    @classmethod
+    def memoized_dependents(cls):
+        """Returns the names of the memoized properties depending on
+        each memoized property.
+        """
+        dependents = {}
+        for klass in cls.__mro__:
+            for attr in vars(klass).values():
+                if isinstance(attr, memoized_property):
+                    for name in attr.dependencies:
+                        dependents.setdefault(name, set()).add(attr.name)
+        return dependents
+
+    def invalidate(self, *names):
+        """Clears the memoized values of the named properties and of
+        the properties depending on them, or all if none are named, so
+        they are re-read on next access.
+        """
+        memo = self.__dict__.get('_memoized', {})
+        if not names:
+            memo.clear()
+        dependents = self.memoized_dependents()
+        cleared = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in cleared:
+                cleared.add(name)
+                memo.pop(name, None)
+                pending.extend(dependents.get(name, ()))
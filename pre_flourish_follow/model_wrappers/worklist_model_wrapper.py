@@ -5,12 +5,16 @@ from django.db.models import Q
 from edc_constants.constants import NOT_APPLICABLE
 from edc_model_wrapper import ModelWrapper
 
+from ..caregiver_locators import latest_locators
+from ..instrumentation import instrumented
+
 from ..model_wrappers import InPersonContactAttemptModelWrapper
 from ..models import *
 from .log_entry_model_wrapper import LogEntryModelWrapper
+from .memoized_property import MemoizedPropertiesMixin, memoized_property
 
 
-class WorkListModelWrapper(ModelWrapper):
+class WorkListModelWrapper(MemoizedPropertiesMixin, ModelWrapper):
 
     model = 'pre_flourish_follow.preflourishworklist'
     querystring_attrs = ['subject_identifier', 'study_maternal_identifier']
@@ -19,27 +23,32 @@ class WorkListModelWrapper(ModelWrapper):
         'pre_flourish_follow_listboard_url')
 
     @property
+    def prefetched(self):
+        """Related rows bulk loaded for the page by WorkListPrefetch.
+        """
+        return self.__dict__.get('_prefetched')
+
+    @prefetched.setter
+    def prefetched(self, value):
+        self.__dict__['_prefetched'] = value
+        self.invalidate()
+
+    @memoized_property
+    @instrumented
     def subject_locator(self):
-        SubjectLocator = django_apps.get_model(
-            'flourish_caregiver.caregiverlocator')
+        if self.prefetched is not None:
+            return self.prefetched.get('subject_locator')
         if self.object.subject_identifier:
-            try:
-                locator = SubjectLocator.objects.get(
-                    subject_identifier=self.object.subject_identifier)
-            except SubjectLocator.DoesNotExist:
-                try:
-                    locator = SubjectLocator.objects.filter(
-                        study_maternal_identifier=self.object.study_maternal_identifier).latest('report_datetime')
-                except SubjectLocator.DoesNotExist:
-                    return None
-                else:
-                    return locator
-            else:
-                return locator
+            return (latest_locators.get(
+                        self.object.subject_identifier, field='subject_identifier')
+                    or latest_locators.get(self.object.study_maternal_identifier))
         return None
 
-    @property
+    @memoized_property
+    @instrumented
     def maternal_dataset(self):
+        if self.prefetched is not None:
+            return self.prefetched.get('maternal_dataset')
         maternal_dataset_cls = django_apps.get_model(
             'flourish_caregiver.maternaldataset')
         try:
@@ -65,42 +74,72 @@ class WorkListModelWrapper(ModelWrapper):
     def call_datetime(self):
         return self.object.called_datetime
 
-    @property
-    def call(self):
-        call = PreFlourishCall.objects.filter(
+    @memoized_property
+    @instrumented
+    def latest_call(self):
+        if self.prefetched is not None:
+            return self.prefetched.get('call')
+        return PreFlourishCall.objects.filter(
             subject_identifier=self.object.subject_identifier).order_by('scheduled').last()
-        return str(call.id)
 
-    @property
+    @memoized_property.depends_on('latest_call')
+    @instrumented
+    def latest_call_log(self):
+        if self.prefetched is not None and self.prefetched.get('call_log'):
+            return self.prefetched.get('call_log')
+        return PreFlourishLog.objects.get(call=self.latest_call)
+
+    @memoized_property.depends_on('latest_call')
+    def call(self):
+        return str(self.latest_call.id)
+
+    @memoized_property.depends_on('latest_call_log')
     def call_log(self):
-        call = PreFlourishCall.objects.filter(
-            subject_identifier=self.object.subject_identifier).order_by('scheduled').last()
-        call_log = PreFlourishLog.objects.get(call=call)
-        return str(call_log.id)
+        return str(self.latest_call_log.id)
 
     @property
+    @instrumented
     def log_entries(self):
         wrapped_entries = []
-        
+
+        if self.prefetched is not None:
+            return [LogEntryModelWrapper(log_entry)
+                    for log_entry in self.prefetched.get('log_entries')]
+
         #FIXME: Call is empty, was throwing an exception. A check was added, as a temp fix
         
-        call = PreFlourishCall.objects.filter(
-            subject_identifier=self.object.subject_identifier).order_by('scheduled').last()
-        
+        call = self.latest_call
         if call:
             log_entries = PreFlourishLogEntry.objects.filter(
-                log__call__subject_identifier=call.subject_identifier).order_by('-call_datetime')[:3]
+                log__call__subject_identifier=call.subject_identifier).order_by(
+                    '-call_datetime', '-id')[:3]
             for log_entry in log_entries:
                 wrapped_entries.append(
                     LogEntryModelWrapper(log_entry))
         return wrapped_entries
 
+    @memoized_property
+    @instrumented
+    def in_person_log(self):
+        if self.prefetched is not None:
+            return self.prefetched.get('in_person_log')
+        try:
+            return self.object.preflourishinpersonlog
+        except PreFlourishInPersonLog.DoesNotExist:
+            return None
+
     @property
+    @instrumented
     def home_visit_log_entries(self):
 
         wrapped_entries = []
-        if hasattr(self.object, 'inpersonlog'):
-            in_person_log = getattr(self.object, 'inpersonlog')
+        in_person_log = self.in_person_log
+        if self.prefetched is not None:
+            log_entries = self.prefetched.get('in_person_attempts')
+            for log_entry in log_entries:
+                wrapped_entries.append(
+                    InPersonContactAttemptModelWrapper(log_entry))
+        elif in_person_log:
             log_entries = PreFlourishInPersonContactAttempt.objects.filter(
                 in_person_log=in_person_log)
             for log_entry in log_entries:
@@ -111,17 +150,15 @@ class WorkListModelWrapper(ModelWrapper):
 
     @property
     def home_visit_log_entry(self):
-        # FIXME: Throws an exception because does not exist for the current object
-        if hasattr(self.object, 'inpersonlog'):
-            in_person_log = getattr(self.object, 'inpersonlog')
-            
+        in_person_log = self.in_person_log
+        if in_person_log:
             log_entry = PreFlourishInPersonContactAttempt(
                 in_person_log=in_person_log,
                 prev_study=self.prev_protocol,
                 study_maternal_identifier=self.study_maternal_identifier)
             return InPersonContactAttemptModelWrapper(log_entry)
 
-    @property
+    @memoized_property.depends_on('subject_locator')
     def locator_phone_numbers(self):
         """Return all contact numbers on the locator.
         """
@@ -151,10 +188,13 @@ class WorkListModelWrapper(ModelWrapper):
             return True
         return False
 
-    @property
+    @memoized_property
+    @instrumented
     def perform_home_visit(self):
         """Returns True is an RA took the descretions to do a home visit.
         """
+        if self.prefetched is not None:
+            return self.prefetched.get('perform_home_visit')
         log_entries = PreFlourishLogEntry.objects.filter(
             study_maternal_identifier=self.object.study_maternal_identifier)
         for log in log_entries:
@@ -163,6 +203,7 @@ class WorkListModelWrapper(ModelWrapper):
         return False
 
     @property
+    @instrumented
     def home_visit_required(self):
         check_fields = [
             'cell_contact_fail', 'alt_cell_contact_fail',
@@ -174,6 +215,10 @@ class WorkListModelWrapper(ModelWrapper):
             return True
         elif self.perform_home_visit:
             return True
+        elif self.prefetched is not None:
+            if self.prefetched.get('no_response'):
+                return False
+            return self.prefetched.get('disconnected')
         else:
             log_entries = PreFlourishLogEntry.objects.filter(
                 ~Q(phone_num_success='none_of_the_above'),
@@ -193,15 +238,14 @@ class WorkListModelWrapper(ModelWrapper):
 
     @property
     def log_entry(self):
-        log = PreFlourishLog.objects.get(id=self.call_log)
-
         logentry = PreFlourishLogEntry(
-            log=log,
+            log=self.latest_call_log,
             prev_study=self.prev_protocol,
             study_maternal_identifier=self.study_maternal_identifier)
         return LogEntryModelWrapper(logentry)
 
     @property
+    @instrumented
     def subject_consent(self):
         return django_apps.get_model(
             'flourish_caregiver.subjectconsent').objects.filter(
@@ -0,0 +1,184 @@
+from django.apps import apps as django_apps
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from edc_constants.constants import NOT_APPLICABLE
+
+from ..caregiver_locators import latest_locators
+
+from ..models import (PreFlourishCall, PreFlourishInPersonContactAttempt,
+                      PreFlourishInPersonLog, PreFlourishLog, PreFlourishLogEntry,
+                      PreFlourishWorkList)
+
+
+class WorkListPrefetch:
+
+    """Bulk loads the locators, calls, logs, log entries and in-person
+    attempts for a page of worklist objects and hands each object its
+    precomputed slice, see WorkListModelWrapper.prefetched.
+
+    The number of queries is fixed regardless of the page size or the
+    number of locator and log rows per participant.
+    """
+
+    recent_log_entries = 3
+
+    check_fields = [
+        'cell_contact_fail', 'alt_cell_contact_fail',
+        'tel_contact_fail', 'alt_tel_contact_fail',
+        'work_contact_fail', 'cell_alt_contact_fail',
+        'tel_alt_contact_fail', 'cell_resp_person_fail',
+        'tel_resp_person_fail']
+
+    def __init__(self, worklist_objs=None):
+        self.worklist_objs = list(worklist_objs or [])
+        self.subject_identifiers = set(
+            obj.subject_identifier for obj in self.worklist_objs
+            if obj.subject_identifier)
+        self.study_maternal_identifiers = set(
+            obj.study_maternal_identifier for obj in self.worklist_objs)
+        self.locators = {}
+        self.study_locators = {}
+        self.maternal_datasets = {}
+        self.calls = {}
+        self.logs = {}
+        self.log_entries = {}
+        self.home_visit_flags = {}
+        self.in_person_logs = {}
+        self.in_person_attempts = {}
+        if self.worklist_objs:
+            self.load()
+
+    def load(self):
+        self.load_locators()
+        self.load_maternal_datasets()
+        self.load_calls()
+        self.load_log_entries()
+        self.load_home_visit_flags()
+        self.load_in_person_attempts()
+
+    def for_object(self, obj):
+        """Returns the prefetched slice for a worklist object.
+        """
+        locator = None
+        if obj.subject_identifier:
+            locator = (self.locators.get(obj.subject_identifier)
+                       or self.study_locators.get(obj.study_maternal_identifier))
+        call = self.calls.get(obj.subject_identifier)
+        flags = self.home_visit_flags.get(obj.pk, {})
+        return {
+            'subject_locator': locator,
+            'maternal_dataset': self.maternal_datasets.get(
+                obj.study_maternal_identifier),
+            'call': call,
+            'call_log': self.logs.get(call.id) if call else None,
+            'log_entries': self.log_entries.get(obj.subject_identifier, []),
+            'perform_home_visit': flags.get('perform_home_visit', False),
+            'no_response': flags.get('no_response', False),
+            'disconnected': flags.get('disconnected', False),
+            'in_person_log': self.in_person_logs.get(obj.pk),
+            'in_person_attempts': self.in_person_attempts.get(obj.pk, [])}
+
+    def load_locators(self):
+        """Loads the locators for the page, the latest per
+        subject_identifier and per study_maternal_identifier.
+        """
+        locator_cls = django_apps.get_model(
+            'flourish_caregiver.caregiverlocator')
+        locators = locator_cls.objects.filter(
+            Q(subject_identifier__in=self.subject_identifiers)
+            | Q(study_maternal_identifier__in=self.study_maternal_identifiers)).order_by(
+                'report_datetime')
+        for locator in locators:
+            if locator.subject_identifier in self.subject_identifiers:
+                self.locators[locator.subject_identifier] = locator
+            self.study_locators[locator.study_maternal_identifier] = locator
+        latest_locators.prime({
+            idx: self.study_locators.get(idx, latest_locators.missing)
+            for idx in self.study_maternal_identifiers if idx})
+        latest_locators.prime({
+            idx: self.locators.get(idx, latest_locators.missing)
+            for idx in self.subject_identifiers}, field='subject_identifier')
+
+    def load_maternal_datasets(self):
+        maternal_dataset_cls = django_apps.get_model(
+            'flourish_caregiver.maternaldataset')
+        maternal_datasets = maternal_dataset_cls.objects.filter(
+            study_maternal_identifier__in=self.study_maternal_identifiers)
+        for maternal_dataset in maternal_datasets:
+            self.maternal_datasets[
+                maternal_dataset.study_maternal_identifier] = maternal_dataset
+
+    def load_calls(self):
+        """Loads the latest scheduled call per subject and its log.
+        """
+        latest_call = PreFlourishCall.objects.filter(
+            subject_identifier=OuterRef('subject_identifier')).order_by(
+                '-scheduled').values('id')[:1]
+        calls = PreFlourishCall.objects.filter(
+            subject_identifier__in=self.subject_identifiers).annotate(
+                latest_call_id=Subquery(latest_call)).filter(id=F('latest_call_id'))
+        for call in calls:
+            self.calls[call.subject_identifier] = call
+        for log in PreFlourishLog.objects.filter(call__in=list(self.calls.values())):
+            self.logs[log.call_id] = log
+
+    def load_log_entries(self):
+        """Loads the most recent log entries per subject, limited in the
+        database to `recent_log_entries` rows each, breaking ties on
+        call_datetime by id as the wrapper does.
+        """
+        newer_entries = PreFlourishLogEntry.objects.filter(
+            Q(call_datetime__gt=OuterRef('call_datetime'))
+            | Q(call_datetime=OuterRef('call_datetime'), id__gt=OuterRef('id')),
+            log__call__subject_identifier=OuterRef(
+                'log__call__subject_identifier')).order_by().values(
+                'log__call__subject_identifier').annotate(
+                    newer=Count('id')).values('newer')
+        log_entries = PreFlourishLogEntry.objects.filter(
+            log__call__subject_identifier__in=self.subject_identifiers).annotate(
+                newer=Coalesce(Subquery(newer_entries, output_field=IntegerField()),
+                               Value(0))).filter(
+                    newer__lt=self.recent_log_entries).select_related(
+                        'log__call').order_by('-call_datetime', '-id')
+        for log_entry in log_entries:
+            self.log_entries.setdefault(
+                log_entry.log.call.subject_identifier, []).append(log_entry)
+
+    def load_home_visit_flags(self):
+        """Loads the flags used by perform_home_visit and home_visit_required
+        as EXISTS annotations instead of scanning each participant's logs.
+        """
+        log_entries = PreFlourishLogEntry.objects.filter(
+            study_maternal_identifier=OuterRef('study_maternal_identifier'))
+        answered = log_entries.exclude(phone_num_success='none_of_the_above')
+
+        def answer_q(*values):
+            q = Q()
+            for field in self.check_fields:
+                q |= Q(**{f'{field}__in': values})
+            return q
+
+        flags = PreFlourishWorkList.objects.filter(
+            pk__in=[obj.pk for obj in self.worklist_objs]).annotate(
+                perform_home_visit=Exists(log_entries.exclude(
+                    Q(home_visit__isnull=True)
+                    | Q(home_visit__in=['', NOT_APPLICABLE]))),
+                no_response=Exists(answered.filter(
+                    answer_q('no_response', 'no_response_vm_not_left'))),
+                disconnected=Exists(answered.filter(
+                    answer_q('disconnected')))).values(
+                        'pk', 'perform_home_visit', 'no_response', 'disconnected')
+        for flag in flags:
+            self.home_visit_flags[flag.pop('pk')] = flag
+
+    def load_in_person_attempts(self):
+        in_person_logs = PreFlourishInPersonLog.objects.filter(
+            worklist__in=self.worklist_objs)
+        for in_person_log in in_person_logs:
+            self.in_person_logs[in_person_log.worklist_id] = in_person_log
+        attempts = PreFlourishInPersonContactAttempt.objects.filter(
+            in_person_log__in=in_person_logs).select_related('in_person_log')
+        for attempt in attempts:
+            self.in_person_attempts.setdefault(
+                attempt.in_person_log.worklist_id, []).append(attempt)
@@ -1,9 +1,11 @@
 from .booking import *
 from .call_models import *
+from .child_eligibility import PreFlourishChildEligibility
 from .eligibility_mixin import EligibilityMixin
 from .export_file import *
 from .home_visit_models import *
 from .list_models import *
-from .signals import (cal_log_entry_on_post_save, in_person_contact_attempt_on_post_save,
-                      worklist_on_post_save)
+from .report_snapshot import PreFlourishReportSnapshot
+from .signals import (cal_log_entry_on_post_save, caregiver_locator_on_post_save,
+                      in_person_contact_attempt_on_post_save, worklist_on_post_save)
 from .worklist import *
@@ -67,3 +67,9 @@ class PreFlourishBooking(SiteModelMixin, SearchSlugModelMixin, BaseUuidModel):
         app_label = 'pre_flourish_follow'
         verbose_name = 'Booking'
         unique_together = ('first_name', 'last_name')
+        indexes = [
+            models.Index(
+                fields=['study_maternal_identifier'],
+                name='pf_booking_smid_idx'),
+            # Date range filters and the booking dashboard counters.
+            models.Index(fields=['booking_date'], name='pf_booking_date_idx')]
@@ -257,3 +257,10 @@ class PreFlourishLogEntry(EligibilityMixin, BaseUuidModel):
         app_label = 'pre_flourish_follow'
         verbose_name = 'Call Log Entry'
         verbose_name_plural = 'Call Log Entries'
+        indexes = [
+            # Participant history and latest entry lookups.
+            models.Index(
+                fields=['study_maternal_identifier', '-call_datetime'],
+                name='pf_logentry_smid_call_idx'),
+            # Incremental calls reports snapshot refresh.
+            models.Index(fields=['modified'], name='pf_logentry_modified_idx')]
@@ -0,0 +1,30 @@
+from django.db import models
+from edc_base.model_mixins import BaseUuidModel
+from edc_base.utils import get_utcnow
+
+
+class PreFlourishChildEligibility(BaseUuidModel):
+
+    """The flourish eligibility of a pre flourish child as returned by
+    `is_flourish_eligible`, kept so the enrolment report reads it for
+    all children in one query.
+    """
+
+    subject_identifier = models.CharField(
+        verbose_name='Subject Identifier',
+        max_length=50,
+        unique=True)
+
+    flourish_eligible = models.BooleanField(default=False)
+
+    evaluated_datetime = models.DateTimeField(
+        verbose_name='Evaluated date and time',
+        default=get_utcnow)
+
+    def __str__(self):
+        return f'{self.subject_identifier}'
+
+    class Meta:
+        app_label = 'pre_flourish_follow'
+        verbose_name = 'Child Flourish Eligibility'
+        verbose_name_plural = 'Child Flourish Eligibility'
@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from edc_base.model_mixins import BaseUuidModel
 
@@ -5,6 +6,8 @@ from edc_base.sites import SiteModelMixin
 from edc_search.model_mixins import SearchSlugManager
 from edc_search.model_mixins import SearchSlugModelMixin as Base
 
+from ..choices import EXPORT_STATUS
+
 
 class ExportFileManager(SearchSlugManager, models.Manager):
 
@@ -50,6 +53,37 @@ class PreFlourishFollowExportFile(SiteModelMixin, SearchSlugModelMixin, BaseUuid
         null=True,
         blank=True)
 
+    report_type = models.CharField(max_length=100, blank=True)
+
+    status = models.CharField(
+        verbose_name='Export status',
+        max_length=10,
+        choices=EXPORT_STATUS,
+        default='done',
+        db_index=True)
+
+    progress = models.PositiveSmallIntegerField(
+        verbose_name='Export progress (%)',
+        default=0)
+
+    rows_written = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Rows written so far, by exports that do not count their rows.')
+
+    error = models.TextField(blank=True, null=True)
+
+    export_params = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict,
+        editable=False,
+        help_text='Request parameters the report view rebuilds the export from.')
+
+    heartbeat = models.DateTimeField(
+        null=True,
+        editable=False,
+        help_text='Last time a running export reported progress.')
+
     def __str__(self):
         return f'{self.export_identifier}'
 
@@ -69,7 +103,16 @@ class PreFlourishFollowExportFile(SiteModelMixin, SearchSlugModelMixin, BaseUuid
             return self.document.url
         except ValueError:
             return None
-        
-        
+
+    @property
+    def in_progress(self):
+        return self.status in ['pending', 'running']
+
+    @property
+    def progress_display(self):
+        if not self.progress and self.rows_written:
+            return f'{self.rows_written} rows'
+        return f'{self.progress}%'
+
     class Meta:
         app_label = 'pre_flourish_follow'
@@ -106,3 +106,7 @@ class PreFlourishInPersonContactAttempt(BaseUuidModel):
         app_label = 'pre_flourish_follow'
         verbose_name = 'In Person Contact Attempt'
         verbose_name_plural = 'In Person Contact Attempt'
+        indexes = [
+            models.Index(
+                fields=['study_maternal_identifier', '-contact_date'],
+                name='pf_inperson_smid_date_idx')]
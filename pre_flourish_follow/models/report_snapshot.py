@@ -0,0 +1,56 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from edc_base.model_mixins import BaseUuidModel
+from edc_base.utils import get_utcnow
+
+
+class PreFlourishReportSnapshot(BaseUuidModel):
+
+    """A stored copy of the calls reports, refreshed incrementally by
+    the `refresh_calls_reports` management command. Only the latest is
+    kept.
+    """
+
+    snapshot_datetime = models.DateTimeField(
+        verbose_name='Snapshot date and time',
+        default=get_utcnow)
+
+    full_refresh_datetime = models.DateTimeField(
+        verbose_name='Last full refresh date and time',
+        null=True)
+
+    contact_attempts = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict)
+
+    eligibility_report = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict)
+
+    enrolment_report = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict)
+
+    eligibility_rows = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=dict,
+        help_text='Latest log entry values keyed by study maternal identifier.')
+
+    enrolment_rows = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        default=list,
+        help_text='Pre-flourish to Flourish enrolment rows per child consent.')
+
+    def __str__(self):
+        return f'{self.snapshot_datetime}'
+
+    @property
+    def age(self):
+        """Returns the time elapsed since the snapshot was taken.
+        """
+        return get_utcnow() - self.snapshot_datetime
+
+    class Meta:
+        app_label = 'pre_flourish_follow'
+        verbose_name = 'Report Snapshot'
+        get_latest_by = 'snapshot_datetime'
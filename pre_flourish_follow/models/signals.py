@@ -1,7 +1,8 @@
 from django.apps import apps as django_apps
 from django.contrib.auth.models import Group, User
 from django.core.exceptions import ValidationError
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from edc_constants.constants import YES
@@ -10,6 +11,17 @@ from ..models.worklist import PreFlourishWorkList
 from .home_visit_models import PreFlourishInPersonLog, PreFlourishInPersonContactAttempt
 from .call_models import PreFlourishLogEntry
 from .booking import PreFlourishBooking
+from ..caregiver_locators import latest_locators
+
+# (username, group name) pairs already ensured in this process, see
+# add_user_to_group. Recorded on commit, so a rolled back membership is
+# added again.
+ensured_memberships = set()
+
+
+def record_memberships(memberships):
+    memberships = set(memberships)
+    transaction.on_commit(lambda: ensured_memberships.update(memberships))
 
 
 @receiver(post_save, weak=False, sender=PreFlourishLogEntry,
@@ -30,14 +42,9 @@ def cal_log_entry_on_post_save(sender, instance, using, raw, **kwargs):
                 work_list.save()
 
         # Create or update a booking
-        SubjectLocator = django_apps.get_model(
-            'flourish_caregiver.caregiverlocator')
         if instance.appt == YES:
-            try:
-                locator = SubjectLocator.objects.filter(
-                    study_maternal_identifier=instance.study_maternal_identifier).latest(
-                        'report_datetime')
-            except SubjectLocator.DoesNotExist:
+            locator = latest_locators.get(instance.study_maternal_identifier)
+            if not locator:
                 return None
             else:
                 try:
@@ -56,48 +63,20 @@ def cal_log_entry_on_post_save(sender, instance, using, raw, **kwargs):
                     booking.save()
 
         # Add user to Recruiters group
-        try:
-            recruiters_group = Group.objects.get(name='Recruiters')
-        except Group.DoesNotExist:
-            raise ValidationError('Recruiters group must exist.')
-        else:
-            try:
-                user = User.objects.get(username=instance.user_created)
-            except User.DoesNotExist:
-                raise ValueError(f'The user {instance.user_created}, does not exist.')
-            else:
-                if not User.objects.filter(username=instance.user_created,
-                                           groups__name='Recruiters').exists():
-                    recruiters_group.user_set.add(user)
+        add_user_to_group(instance.user_created, 'Recruiters')
 
 
 @receiver(post_save, weak=False, sender=PreFlourishWorkList,
           dispatch_uid="worklist_on_post_save")
 def worklist_on_post_save(sender, instance, using, raw, **kwargs):
     if not raw:
-        try:
-            PreFlourishInPersonLog.objects.get(
-                study_maternal_identifier=instance.study_maternal_identifier)
-        except PreFlourishInPersonLog.DoesNotExist:
-            PreFlourishInPersonLog.objects.create(
-                worklist=instance,
-                study_maternal_identifier=instance.study_maternal_identifier)
+        PreFlourishInPersonLog.objects.get_or_create(
+            study_maternal_identifier=instance.study_maternal_identifier,
+            defaults={'worklist': instance})
 
         # Add user to assignable group
         app_config = django_apps.get_app_config('pre_flourish_follow')
-        try:
-            assignable_users_group = Group.objects.get(name=app_config.assignable_users_group)
-        except Group.DoesNotExist:
-            raise ValidationError('assignable users group must exist.')
-        else:
-            try:
-                user = User.objects.get(username=instance.user_created)
-            except User.DoesNotExist:
-                raise ValueError(f'The user {instance.user_created}, does not exist.')
-            else:
-                if not User.objects.filter(username=instance.user_created,
-                                           groups__name=app_config.assignable_users_group).exists():
-                    assignable_users_group.user_set.add(user)
+        add_user_to_group(instance.user_created, app_config.assignable_users_group)
 
 
 @receiver(post_save, weak=False, sender=PreFlourishInPersonContactAttempt,
@@ -114,3 +93,106 @@ def in_person_contact_attempt_on_post_save(sender, instance, using, raw, **kwarg
                 work_list.visited = True
                 work_list.user_modified = instance.user_modified
                 work_list.save()
+
+
+@receiver(pre_save, weak=False, sender='flourish_caregiver.caregiverlocator',
+          dispatch_uid="caregiver_locator_on_pre_save")
+def caregiver_locator_on_pre_save(sender, instance, using, raw, **kwargs):
+    # Keep the stored identifiers, the post_save receiver invalidates
+    # them too if the save changes them.
+    instance._previous_locator_identifiers = None
+    if not raw and not instance._state.adding:
+        instance._previous_locator_identifiers = sender.objects.using(
+            using).filter(pk=instance.pk).values(
+                'study_maternal_identifier', 'subject_identifier').first()
+
+
+@receiver(post_save, weak=False, sender='flourish_caregiver.caregiverlocator',
+          dispatch_uid="caregiver_locator_on_post_save")
+@receiver(post_delete, weak=False, sender='flourish_caregiver.caregiverlocator',
+          dispatch_uid="caregiver_locator_on_post_delete")
+def caregiver_locator_on_post_save(sender, instance, using, **kwargs):
+    previous = getattr(instance, '_previous_locator_identifiers', None) or {}
+    for field in ['study_maternal_identifier', 'subject_identifier']:
+        for identifier in {getattr(instance, field), previous.get(field)}:
+            if identifier:
+                latest_locators.invalidate(identifier, field=field)
+
+
+@receiver(m2m_changed, weak=False, sender=User.groups.through,
+          dispatch_uid="user_groups_on_m2m_changed")
+def user_groups_on_m2m_changed(sender, instance, action, **kwargs):
+    if action in ['post_remove', 'post_clear']:
+        ensured_memberships.clear()
+
+
+@receiver(post_delete, weak=False, sender=User,
+          dispatch_uid="user_on_post_delete")
+@receiver(post_delete, weak=False, sender=Group,
+          dispatch_uid="group_on_post_delete")
+def user_or_group_on_post_delete(sender, instance, using, **kwargs):
+    ensured_memberships.clear()
+
+
+def add_user_to_group(username, group_name):
+    """Adds the user to the group unless this process already did,
+    so repeat saves by the same user run no queries.
+    """
+    if (username, group_name) in ensured_memberships:
+        return
+    try:
+        group = Group.objects.get(name=group_name)
+    except Group.DoesNotExist:
+        raise ValidationError(f'{group_name} group must exist.')
+    else:
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise ValueError(f'The user {username}, does not exist.')
+        else:
+            if not User.objects.filter(username=username,
+                                       groups__name=group_name).exists():
+                group.user_set.add(user)
+    record_memberships([(username, group_name)])
+
+
+def create_in_person_logs(worklists):
+    """Bulk creates the missing in-person logs for a batch of worklist
+    records, see worklist_on_post_save.
+    """
+    worklists = list(worklists)
+    existing = set(PreFlourishInPersonLog.objects.filter(
+        study_maternal_identifier__in=[
+            worklist.study_maternal_identifier for worklist in worklists]).values_list(
+                'study_maternal_identifier', flat=True))
+    PreFlourishInPersonLog.objects.bulk_create([
+        PreFlourishInPersonLog(
+            worklist=worklist,
+            study_maternal_identifier=worklist.study_maternal_identifier)
+        for worklist in worklists
+        if worklist.study_maternal_identifier not in existing])
+
+
+def add_users_to_assignable_group(usernames):
+    """Adds a batch of users to the assignable users group, see
+    worklist_on_post_save.
+    """
+    app_config = django_apps.get_app_config('pre_flourish_follow')
+    usernames = set(
+        username for username in usernames
+        if (username, app_config.assignable_users_group) not in ensured_memberships)
+    if not usernames:
+        return
+    try:
+        assignable_users_group = Group.objects.get(name=app_config.assignable_users_group)
+    except Group.DoesNotExist:
+        raise ValidationError('assignable users group must exist.')
+    else:
+        users = list(User.objects.filter(username__in=usernames))
+        missing = usernames - set(user.username for user in users)
+        if missing:
+            raise ValueError(f'The user {", ".join(sorted(missing))}, does not exist.')
+        assignable_users_group.user_set.add(*users)
+        record_memberships(
+            (username, app_config.assignable_users_group) for username in usernames)
+
@@ -1,8 +1,12 @@
-from django.db import models
+import socket
+
+from django.apps import apps as django_apps
+from django.db import models, transaction
 
 from edc_base.model_mixins import BaseUuidModel
 from edc_base.model_validators.date import datetime_not_future, date_not_future
 from edc_base.sites.site_model_mixin import SiteModelMixin
+from edc_base.utils import get_utcnow
 from edc_search.model_mixins import SearchSlugModelMixin, SearchSlugManager
 
 
@@ -13,7 +17,115 @@ class BaseWorkManager(models.Manager):
 
 
 class WorklistManager(BaseWorkManager, SearchSlugManager):
-    pass
+
+    def available(self, prev_study=None, exclude_over_age_limit=True):
+        """Returns the worklist records not yet called, assigned or
+        consented, excluding those flagged over the child age limit.
+        """
+        options = dict(
+            is_called=False, assigned=None, date_assigned=None, consented=False)
+        if prev_study:
+            options.update(prev_study=prev_study)
+        if exclude_over_age_limit:
+            options.update(over_age_limit=False)
+        return self.filter(**options)
+
+    def over_age_identifiers(self, study_maternal_identifiers=None):
+        """Returns the study maternal identifiers, optionally limited to
+        the given ones, whose child in the child dataset has reached the
+        app config child_age_limit, as a values queryset.
+        """
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        child_dataset_cls = django_apps.get_model('flourish_child.childdataset')
+        over_age = child_dataset_cls.objects.filter(
+            age_today__gte=app_config.child_age_limit)
+        if study_maternal_identifiers is not None:
+            over_age = over_age.filter(
+                study_maternal_identifier__in=study_maternal_identifiers)
+        return over_age.values('study_maternal_identifier')
+
+    def refresh_over_age_limit(self):
+        """Flags the worklist records whose child in the child dataset
+        has reached the app config child_age_limit, and clears the flag
+        for the others. Returns the number of records flagged and cleared.
+        """
+        over_age = self.over_age_identifiers()
+        with transaction.atomic():
+            flagged = self.filter(
+                over_age_limit=False,
+                study_maternal_identifier__in=over_age).update(over_age_limit=True)
+            cleared = self.filter(over_age_limit=True).exclude(
+                study_maternal_identifier__in=over_age).update(over_age_limit=False)
+        return flagged, cleared
+
+    def claim_participants(self, count=None, username=None, prev_study=None,
+                           user_modified=None, exclude_over_age_limit=True):
+        """Selects `count` random available participants in the database,
+        or all of them if count is None, and assigns them to `username`.
+
+        The selected rows are locked with SKIP LOCKED until assigned, so
+        coordinators claiming at the same time never receive the same
+        participants. Children who reached the age limit since the flag
+        was last refreshed are excluded too. Returns the claimed study
+        maternal identifiers.
+        """
+        with transaction.atomic():
+            available = self.available(
+                prev_study=prev_study, exclude_over_age_limit=exclude_over_age_limit)
+            if exclude_over_age_limit:
+                available = available.exclude(
+                    study_maternal_identifier__in=self.over_age_identifiers())
+            available = available.select_for_update(skip_locked=True).order_by(
+                '?').values_list('study_maternal_identifier', flat=True)
+            if count is not None:
+                available = available[:count]
+            identifiers = list(available)
+            self.assign_participants(
+                study_maternal_identifiers=identifiers,
+                username=username,
+                user_modified=user_modified,
+                exclude_over_age_limit=False)
+        return identifiers
+
+    def assign_participants(self, study_maternal_identifiers=None, username=None,
+                            user_modified=None, batch_size=500,
+                            exclude_over_age_limit=True):
+        """Assigns the worklist records of the given participants to
+        `username` with one UPDATE per batch and runs the
+        worklist_on_post_save side effects once per batch.
+
+        With `exclude_over_age_limit` participants whose child has
+        reached the age limit are flagged instead of assigned.
+
+        Returns the number of records assigned.
+        """
+        from .signals import add_users_to_assignable_group, create_in_person_logs
+
+        study_maternal_identifiers = list(study_maternal_identifiers or [])
+        assigned = 0
+        for index in range(0, len(study_maternal_identifiers), batch_size):
+            batch = study_maternal_identifiers[index:index + batch_size]
+            with transaction.atomic():
+                if exclude_over_age_limit:
+                    over_age = set(self.over_age_identifiers(batch).values_list(
+                        'study_maternal_identifier', flat=True))
+                    self.filter(
+                        study_maternal_identifier__in=over_age,
+                        over_age_limit=False).update(over_age_limit=True)
+                    batch = [idx for idx in batch if idx not in over_age]
+                assigned += self.filter(study_maternal_identifier__in=batch).update(
+                    assigned=username,
+                    date_assigned=get_utcnow().date(),
+                    modified=get_utcnow(),
+                    user_modified=user_modified or '',
+                    hostname_modified=socket.gethostname()[:60])
+                worklists = list(self.filter(
+                    study_maternal_identifier__in=batch).only(
+                        'id', 'study_maternal_identifier', 'user_created'))
+                create_in_person_logs(worklists)
+                add_users_to_assignable_group(
+                    worklist.user_created for worklist in worklists)
+        return assigned
 
 
 class PreFlourishWorkList(SiteModelMixin, SearchSlugModelMixin, BaseUuidModel):
@@ -62,6 +174,13 @@ class PreFlourishWorkList(SiteModelMixin, SearchSlugModelMixin, BaseUuidModel):
 
     consented = models.BooleanField(default=False)
 
+    over_age_limit = models.BooleanField(
+        default=False,
+        db_index=True,
+        editable=False,
+        help_text=('Child has reached the age limit, set on creation and by '
+                   'refresh_worklist_age_limit.'))
+
     objects = WorklistManager()
 
     def __str__(self):
@@ -77,8 +196,34 @@ class PreFlourishWorkList(SiteModelMixin, SearchSlugModelMixin, BaseUuidModel):
     def save(self, *args, **kwargs):
         if not self.subject_identifier:
             self.subject_identifier = self.study_maternal_identifier
+        if self._state.adding and not self.over_age_limit:
+            self.over_age_limit = type(self).objects.over_age_identifiers(
+                [self.study_maternal_identifier]).exists()
         super().save(*args, **kwargs)
 
     class Meta:
         app_label = 'pre_flourish_follow'
         verbose_name = 'Pre Flourish Worklist'
+        indexes = [
+            # WorklistManager.available, counts and claims per previous study.
+            models.Index(
+                fields=['prev_study', 'over_age_limit'],
+                name='pf_worklist_available_idx',
+                condition=models.Q(
+                    is_called=False, consented=False, assigned__isnull=True,
+                    date_assigned__isnull=True)),
+            # Per user listboards, see WorkListQuerysetViewMixin.
+            models.Index(
+                fields=['assigned', '-modified'],
+                name='pf_worklist_assigned_idx'),
+            # Calls reports and listboard counters.
+            models.Index(
+                fields=['study_maternal_identifier'],
+                name='pf_worklist_called_idx',
+                condition=models.Q(is_called=True)),
+            models.Index(
+                fields=['study_maternal_identifier'],
+                name='pf_worklist_visited_idx',
+                condition=models.Q(visited=True)),
+            # Incremental calls reports snapshot refresh.
+            models.Index(fields=['modified'], name='pf_worklist_modified_idx')]
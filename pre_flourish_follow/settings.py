@@ -42,7 +42,7 @@ INDEX_PAGE = 'flourish.bhp.org.bw'
 
 # AUTO_CREATE_KEYS = True
 
-ETC_DIR = '/etc/flourish'
+ETC_DIR = os.environ.get('FLOURISH_ETC_DIR', '/etc/flourish')
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -107,6 +107,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'edc_dashboard.middleware.DashboardMiddleware',
     'edc_subject_dashboard.middleware.DashboardMiddleware',
+    'pre_flourish_follow.instrumentation.InstrumentationMiddleware',
 ]
 
 ROOT_URLCONF = 'pre_flourish_follow.urls'
@@ -0,0 +1,303 @@
+import datetime
+import random
+
+from django.apps import apps as django_apps
+from edc_appointment.choices import (CANCELLED_APPT, COMPLETE_APPT, INCOMPLETE_APPT,
+                                     NEW_APPT)
+from edc_constants.constants import NO, NOT_APPLICABLE, OTHER, YES
+from edc_visit_schedule import site_visit_schedules
+
+from .models import (PreFlourishBooking, PreFlourishCall, PreFlourishInPersonContactAttempt,
+                     PreFlourishInPersonLog, PreFlourishLog, PreFlourishLogEntry,
+                     PreFlourishWorkList)
+
+
+class SyntheticCohort:
+
+    """Generates a deterministic synthetic cohort with bulk inserts: the
+    worklist, calls, logs, log entries, in-person logs and attempts,
+    bookings, appointments on the visit schedule for the participants
+    whose booking is done, and stand-in caregiver locators and maternal
+    datasets.
+
+    Each participant's rows depend only on `seed`, `reference_datetime`
+    and its index, so a cohort can be grown in steps and always gives the
+    same data.
+    """
+
+    prev_studies = (
+        ('Tshilo Dikotla', 35), ('Mma Bana', 40), ('Mpepu', 15), ('Tshipidi', 10))
+    locator_model = 'flourish_caregiver.caregiverlocator'
+    maternal_dataset_model = 'flourish_caregiver.maternaldataset'
+    appointment_model = 'edc_appointment.appointment'
+    default_reference_datetime = datetime.datetime(
+        2023, 6, 1, 8, tzinfo=datetime.timezone.utc)
+
+    # Status weights of appointments already due, later ones are new.
+    due_appt_statuses = (
+        (COMPLETE_APPT, 75), (INCOMPLETE_APPT, 10), (NEW_APPT, 10), (CANCELLED_APPT, 5))
+
+    def __init__(self, size=1000, seed=2023, start=0, usernames=None,
+                 batch_size=5000, stand_ins=True, appointments=True,
+                 reference_datetime=None, progress=None):
+        self.size = size
+        self.seed = seed
+        self.start = start
+        self.usernames = usernames or [f'recruiter{idx}' for idx in range(1, 11)]
+        self.batch_size = batch_size
+        self.stand_ins = stand_ins
+        self.appointments = appointments
+        self.reference_datetime = reference_datetime or self.default_reference_datetime
+        self.progress = progress
+        self.counts = {}
+
+    @staticmethod
+    def identifier(index):
+        return f'S{index:07d}'
+
+    def generate(self):
+        """Generates the cohort in batches and returns the number of
+        rows created per model.
+        """
+        end = self.start + self.size
+        for batch_start in range(self.start, end, self.batch_size):
+            participants = [
+                self.participant(index)
+                for index in range(batch_start, min(batch_start + self.batch_size, end))]
+            self.create_batch(participants)
+            if self.progress:
+                self.progress(min(batch_start + self.batch_size, end) - self.start, self.size)
+        return self.counts
+
+    def participant(self, index):
+        """Returns the synthetic history of one participant.
+        """
+        rng = random.Random(f'{self.seed}-{index}')
+        identifier = self.identifier(index)
+        prev_study = rng.choices(
+            [name for name, _ in self.prev_studies],
+            weights=[weight for _, weight in self.prev_studies])[0]
+        assigned = rng.choice(self.usernames) if rng.random() < 0.6 else None
+        entries = []
+        if assigned and rng.random() < 0.7:
+            call_datetime = self.reference_datetime - datetime.timedelta(
+                days=rng.randint(1, 90), minutes=rng.randint(0, 600))
+            for _ in range(rng.randint(1, 4)):
+                entries.append(self.log_entry(rng, call_datetime))
+                if entries[-1]['successful']:
+                    break
+                call_datetime += datetime.timedelta(days=rng.randint(1, 7))
+        successful = bool(entries) and entries[-1]['successful']
+        return {
+            'index': index,
+            'identifier': identifier,
+            'prev_study': prev_study,
+            'assigned': assigned,
+            'entries': entries,
+            'is_called': successful,
+            'booking': entries[-1] if successful and entries[-1]['appt'] == YES else None,
+            'in_person_attempts': (
+                rng.randint(1, 2) if entries and not successful and rng.random() < 0.5
+                else 0),
+            'first_name': f'FN{index}',
+            'last_name': f'LN{index}',
+            'phone': f'7{rng.randint(1000000, 9999999)}'}
+
+    def log_entry(self, rng, call_datetime):
+        successful = rng.random() < 0.55
+        entry = {'call_datetime': call_datetime, 'successful': successful,
+                 'phone_num_type': ['subject_cell']}
+        if not successful:
+            entry.update(
+                phone_num_success=['none_of_the_above'],
+                cell_contact_fail=rng.choice(
+                    ['no_response', 'no_response_vm_not_left', 'disconnected',
+                     'number_changed']),
+                has_child=NOT_APPLICABLE, appt=NOT_APPLICABLE, appt_type=None,
+                appt_date=None, may_call=YES)
+            return entry
+        appt = rng.choices([YES, NO, 'thinking'], weights=[50, 25, 25])[0]
+        entry.update(
+            phone_num_success=['subject_cell'],
+            cell_contact_fail=NOT_APPLICABLE,
+            has_child=YES if rng.random() < 0.8 else NO,
+            appt=appt,
+            appt_type=(rng.choices(['screening', 're_call', OTHER], weights=[70, 20, 10])[0]
+                       if appt == YES else None),
+            appt_date=((call_datetime + datetime.timedelta(days=rng.randint(1, 30))).date()
+                       if appt == YES else None),
+            appt_status=rng.choices(['pending', 'done', 'cancelled'], weights=[50, 40, 10])[0],
+            may_call=YES if appt != NO else 'no_flourish_study_calls')
+        return entry
+
+    def audit(self, participant):
+        return {'user_created': participant['assigned'] or 'synthetic',
+                'created': self.reference_datetime,
+                'modified': self.reference_datetime}
+
+    def add_count(self, model_cls, objs):
+        label = model_cls._meta.label_lower
+        self.counts[label] = self.counts.get(label, 0) + len(objs)
+        return objs
+
+    def bulk_create(self, model_cls, objs):
+        return self.add_count(model_cls, model_cls.objects.bulk_create(objs))
+
+    def create_batch(self, participants):
+        worklists = self.bulk_create(PreFlourishWorkList, [
+            PreFlourishWorkList(
+                subject_identifier=p['identifier'],
+                study_maternal_identifier=p['identifier'],
+                prev_study=p['prev_study'],
+                assigned=p['assigned'],
+                date_assigned=self.reference_datetime.date() if p['assigned'] else None,
+                is_called=p['is_called'],
+                called_datetime=(p['entries'][-1]['call_datetime']
+                                 if p['is_called'] else None),
+                **self.audit(p))
+            for p in participants])
+
+        in_person_logs = self.bulk_create(PreFlourishInPersonLog, [
+            PreFlourishInPersonLog(
+                worklist=worklist,
+                study_maternal_identifier=p['identifier'],
+                **self.audit(p))
+            for worklist, p in zip(worklists, participants)])
+
+        calls = self.bulk_create(PreFlourishCall, [
+            PreFlourishCall(subject_identifier=p['identifier'], **self.audit(p))
+            for p in participants])
+        logs = self.bulk_create(PreFlourishLog, [
+            PreFlourishLog(call=call, **self.audit(p))
+            for call, p in zip(calls, participants)])
+
+        self.bulk_create(PreFlourishLogEntry, [
+            PreFlourishLogEntry(
+                log=log,
+                subject_identifier=p['identifier'],
+                study_maternal_identifier=p['identifier'],
+                prev_study=p['prev_study'],
+                **{key: value for key, value in entry.items()
+                   if key not in ['successful', 'appt_status']},
+                **self.audit(p))
+            for log, p in zip(logs, participants) for entry in p['entries']])
+
+        self.bulk_create(PreFlourishInPersonContactAttempt, [
+            PreFlourishInPersonContactAttempt(
+                in_person_log=in_person_log,
+                study_maternal_identifier=p['identifier'],
+                prev_study=p['prev_study'],
+                contact_date=(p['entries'][-1]['call_datetime']
+                              + datetime.timedelta(days=attempt + 1)).date(),
+                contact_location=['physical_address'],
+                successful_location=(['physical_address']
+                                     if attempt == p['in_person_attempts'] - 1
+                                     else ['none_of_the_above']),
+                **self.audit(p))
+            for in_person_log, p in zip(in_person_logs, participants)
+            for attempt in range(p['in_person_attempts'])])
+
+        self.bulk_create(PreFlourishBooking, [
+            PreFlourishBooking(
+                study_maternal_identifier=p['identifier'],
+                first_name=p['first_name'],
+                last_name=p['last_name'],
+                booking_date=p['booking']['appt_date'],
+                appt_type=p['booking']['appt_type'],
+                appt_status=p['booking']['appt_status'],
+                **self.audit(p))
+            for p in participants if p['booking']])
+
+        if self.stand_ins:
+            self.create_stand_ins(participants)
+
+        if self.appointments:
+            self.create_appointments(participants)
+
+    def model_options(self, model_cls, options):
+        """Returns the options for the fields the model has, the stand-in
+        models may be the flourish_caregiver ones or test doubles.
+        """
+        field_names = [field.name for field in model_cls._meta.concrete_fields]
+        return {key: value for key, value in options.items() if key in field_names}
+
+    def create_stand_ins(self, participants):
+        locator_cls = django_apps.get_model(self.locator_model)
+        maternal_dataset_cls = django_apps.get_model(self.maternal_dataset_model)
+        self.bulk_create(locator_cls, [
+            locator_cls(**self.model_options(locator_cls, dict(
+                study_maternal_identifier=p['identifier'],
+                subject_identifier=p['identifier'],
+                screening_identifier=f'X{p["index"]:07d}',
+                first_name=p['first_name'],
+                last_name=p['last_name'],
+                locator_date=self.reference_datetime.date(),
+                report_datetime=self.reference_datetime,
+                may_call=YES,
+                subject_cell=p['phone'],
+                physical_address=f'Plot {p["index"]}, Gaborone',
+                **self.audit(p))))
+            for p in participants])
+        self.bulk_create(maternal_dataset_cls, [
+            maternal_dataset_cls(**self.model_options(maternal_dataset_cls, dict(
+                study_maternal_identifier=p['identifier'],
+                screening_identifier=f'X{p["index"]:07d}',
+                protocol=p['prev_study'],
+                first_name=p['first_name'],
+                last_name=p['last_name'],
+                **self.audit(p))))
+            for p in participants])
+
+    def schedule_visits(self):
+        """Returns the visit schedule name, schedule name and visits of
+        the first schedule registered, or None.
+        """
+        for visit_schedule in site_visit_schedules.visit_schedules.values():
+            for schedule in visit_schedule.schedules.values():
+                return visit_schedule.name, schedule.name, list(schedule.visits.values())
+        return None
+
+    def create_appointments(self, participants):
+        """Creates an appointment per scheduled visit for each participant
+        whose booking is done, from the booking date, with due visits
+        mostly complete and attended within their window.
+        """
+        schedule_visits = self.schedule_visits()
+        if not schedule_visits:
+            return
+        visit_schedule_name, schedule_name, visits = schedule_visits
+        appointment_cls = django_apps.get_model(self.appointment_model)
+        appointments = []
+        for p in participants:
+            if not p['booking'] or p['booking']['appt_status'] != 'done':
+                continue
+            rng = random.Random(f'{self.seed}-{p["index"]}-appointments')
+            base_datetime = datetime.datetime.combine(
+                p['booking']['appt_date'], datetime.time(8),
+                tzinfo=self.reference_datetime.tzinfo)
+            for visit in visits:
+                timepoint_datetime = base_datetime + visit.rbase
+                if timepoint_datetime <= self.reference_datetime:
+                    appt_status = rng.choices(
+                        [status for status, _ in self.due_appt_statuses],
+                        weights=[weight for _, weight in self.due_appt_statuses])[0]
+                    earliest = timepoint_datetime - visit.rlower
+                    latest = timepoint_datetime + visit.rupper
+                    appt_datetime = earliest + (latest - earliest) * rng.random()
+                else:
+                    appt_status = NEW_APPT
+                    appt_datetime = timepoint_datetime
+                appointments.append(appointment_cls(**self.model_options(
+                    appointment_cls, dict(
+                        subject_identifier=p['identifier'],
+                        visit_schedule_name=visit_schedule_name,
+                        schedule_name=schedule_name,
+                        visit_code=visit.code,
+                        visit_code_sequence=0,
+                        timepoint=visit.timepoint,
+                        timepoint_datetime=timepoint_datetime,
+                        appt_datetime=appt_datetime,
+                        appt_status=appt_status,
+                        facility_name=visit.facility_name,
+                        **self.audit(p)))))
+        self.bulk_create(appointment_cls, appointments)
@@ -0,0 +1,47 @@
+from edc_base.utils import get_utcnow
+
+from ..synthetic_cohort import SyntheticCohort
+
+
+class SyntheticCohortTestMixin:
+
+    """Loads a synthetic cohort of `cohort_size` participants once per
+    test case. Use `grow_cohort` to add participants within a test.
+    """
+
+    cohort_size = 0
+    cohort_seed = 2023
+    cohort_usernames = None
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.cohort_datetime = get_utcnow()
+        cls.cohort_end = 0
+        cls.cohort_counts = {}
+        if cls.cohort_size:
+            cls.generate_cohort(cls, cls.cohort_size)
+
+    def setUp(self):
+        super().setUp()
+        # Rows added by a test are rolled back, so start from the class's.
+        self.cohort_end = type(self).cohort_end
+        self.cohort_counts = dict(type(self).cohort_counts)
+
+    def grow_cohort(self, size, **options):
+        """Adds `size` participants after the ones generated so far and
+        returns the number of rows created per model.
+        """
+        return self.generate_cohort(self, size, **options)
+
+    @staticmethod
+    def generate_cohort(owner, size, **options):
+        cohort = SyntheticCohort(
+            size=size, seed=owner.cohort_seed, start=owner.cohort_end,
+            usernames=owner.cohort_usernames,
+            reference_datetime=owner.cohort_datetime, **options)
+        counts = cohort.generate()
+        owner.cohort_end += size
+        for label, count in counts.items():
+            owner.cohort_counts[label] = owner.cohort_counts.get(label, 0) + count
+        return counts
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase, tag
+
+from ..admin import InPersonContactAttemptAdmin, LogEntryAdmin
+from ..admin_site import pre_flourish_follow_admin
+from ..caregiver_locators import latest_locators
+from ..models import PreFlourishInPersonContactAttempt, PreFlourishLogEntry
+
+
+@tag('admin_forms')
+class TestAdminFormQueries(TestCase):
+
+    study_maternal_identifier = '066-17300005-1'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'pass')
+
+    def setUp(self):
+        latest_locators.clear()
+        self.addCleanup(latest_locators.clear)
+        self.locator = SimpleNamespace(
+            subject_cell='71234567',
+            subject_cell_alt=None,
+            subject_phone='3951234',
+            subject_phone_alt=None,
+            subject_work_phone=None,
+            indirect_contact_cell=None,
+            indirect_contact_phone=None,
+            caretaker_cell=None,
+            caretaker_tel=None,
+            physical_address='Plot 123, Gaborone',
+            subject_work_place=None,
+            indirect_contact_physical_address=None)
+
+    def get_request(self):
+        request = RequestFactory().get(
+            '/', {'study_maternal_identifier': self.study_maternal_identifier})
+        request.user = self.user
+        return request
+
+    def test_log_entry_form_resolves_locator_once(self):
+        model_admin = LogEntryAdmin(PreFlourishLogEntry, pre_flourish_follow_admin)
+        with patch.object(latest_locators, 'get', return_value=self.locator) as get:
+            with self.assertNumQueries(0):
+                form = model_admin.get_form(self.get_request())
+        get.assert_called_once_with(self.study_maternal_identifier)
+        self.assertIn('71234567', form.base_fields['cell_contact_fail'].label)
+        self.assertIn('3951234', form.base_fields['tel_contact_fail'].label)
+        self.assertEqual(
+            [choice[0] for choice in form.custom_choices],
+            ['subject_cell', 'subject_phone'])
+
+    def test_in_person_attempt_form_resolves_locator_once(self):
+        model_admin = InPersonContactAttemptAdmin(
+            PreFlourishInPersonContactAttempt, pre_flourish_follow_admin)
+        with patch.object(latest_locators, 'get', return_value=self.locator) as get:
+            with self.assertNumQueries(0):
+                form = model_admin.get_form(self.get_request())
+        get.assert_called_once_with(self.study_maternal_identifier)
+        self.assertIn('Plot 123', form.base_fields['phy_addr_unsuc'].label)
+        self.assertEqual(
+            form.custom_choices, (('physical_address', 'Plot 123, Gaborone'),))
+
+    def test_log_entry_form_query_count(self):
+        """Assert the add and change forms run the single locator query,
+        then none once the locator is cached.
+        """
+        model_admin = LogEntryAdmin(PreFlourishLogEntry, pre_flourish_follow_admin)
+        obj = SimpleNamespace(study_maternal_identifier=self.study_maternal_identifier)
+        with self.assertNumQueries(1):
+            model_admin.get_form(self.get_request())
+        with self.assertNumQueries(0):
+            model_admin.get_form(self.get_request(), obj)
@@ -0,0 +1,37 @@
+import datetime
+
+from dateutil.relativedelta import relativedelta
+from django.db.models import F
+from django.test import TestCase, tag
+
+from ..models import PreFlourishFollowExportFile as FollowExportFile
+from ..views.appointment_windows_view_mixin import AddMonths, AppointmentWindowsViewMixin
+
+
+@tag('appointment_windows')
+class TestAddMonths(TestCase):
+
+    """Asserts month based visit windows computed in the database match
+    the relativedelta calculation of the model wrapper.
+    """
+
+    def assert_matches_relativedelta(self, value, delta):
+        export_file = FollowExportFile.objects.create(
+            export_identifier='E1', description='Test export', heartbeat=value)
+        months, remainder = AppointmentWindowsViewMixin.window_offset(delta)
+        shifted = FollowExportFile.objects.annotate(
+            shifted=AddMonths(F('heartbeat'), months, remainder)).get(
+                pk=export_file.pk).shifted
+        self.assertEqual(shifted, value + delta)
+
+    def test_end_of_month(self):
+        value = datetime.datetime(2023, 1, 31, 8, 30, tzinfo=datetime.timezone.utc)
+        self.assert_matches_relativedelta(value, relativedelta(months=1))
+
+    def test_negative_months_and_days(self):
+        value = datetime.datetime(2023, 3, 31, 8, 30, tzinfo=datetime.timezone.utc)
+        self.assert_matches_relativedelta(value, relativedelta(months=-1, days=-1))
+
+    def test_years(self):
+        value = datetime.datetime(2024, 2, 29, 23, 59, tzinfo=datetime.timezone.utc)
+        self.assert_matches_relativedelta(value, relativedelta(years=1, hours=1))
@@ -0,0 +1,209 @@
+import datetime
+import tracemalloc
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pandas as pd
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, tag
+from django.urls import reverse
+from edc_base.utils import get_utcnow
+from edc_constants.constants import NOT_APPLICABLE, YES
+
+from ..models import (PreFlourishChildEligibility, PreFlourishLogEntry,
+                      PreFlourishReportSnapshot, PreFlourishWorkList)
+from ..views import CallsReports
+from .cohort_mixin import SyntheticCohortTestMixin
+
+
+class TestCallsReportsMemory(SimpleTestCase):
+
+    def setUp(self):
+        self.report_df = pd.DataFrame(
+            [{'subject_identifier': f'B142-040990{idx:03d}-1-10',
+              'pf_consent_dt': datetime.date(2023, 1, 1),
+              'fl_consent_dt': datetime.date(2023, 2, 1),
+              'fl_scheduled_dt': None,
+              'fl_eligible': True} for idx in range(200)])
+
+        model_cls = MagicMock()
+        model_cls.objects.count.return_value = 200
+        patchers = [
+            patch.object(CallsReports, 'enrolment_report_df',
+                         new_callable=PropertyMock, return_value=self.report_df),
+            patch.object(CallsReports, 'screening_model_cls',
+                         new_callable=PropertyMock, return_value=model_cls),
+            patch.object(CallsReports, 'consent_model_cls',
+                         new_callable=PropertyMock, return_value=model_cls)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def load_report(self):
+        view = CallsReports()
+        report = view.generate_enrolment_report
+        table = view.pf_fl_enrolment_df
+        return report, table
+
+    @tag('memory')
+    def test_enrolment_table_size_constant(self):
+        """Assert repeated report loads do not accumulate enrolment rows.
+        """
+        for _ in range(5):
+            report, table = self.load_report()
+            self.assertEqual(report['child_consents_count'], 200)
+            self.assertEqual(len(table), 200)
+        self.assertNotIsInstance(
+            CallsReports.__dict__.get('pf_fl_enrolment'), list)
+
+    @tag('memory')
+    def test_enrolment_report_memory_flat(self):
+        """Assert memory held after repeated report loads does not grow
+        with the number of loads.
+        """
+        for _ in range(5):
+            self.load_report()
+        tracemalloc.start()
+        try:
+            self.load_report()
+            baseline, _ = tracemalloc.get_traced_memory()
+            for _ in range(50):
+                self.load_report()
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(current - baseline, 256 * 1024)
+
+
+@tag('calls_reports_snapshot')
+class TestCallsReportsSnapshot(TestCase):
+
+    url_name = 'pre_flourish_follow:calls_reports_url'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('recruiter', password='pass')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_get_does_not_refresh(self):
+        self.client.get(reverse(self.url_name))
+        snapshot = PreFlourishReportSnapshot.objects.get()
+        self.client.get(reverse(self.url_name), {'refresh': 'yes'})
+        self.assertEqual(PreFlourishReportSnapshot.objects.get(), snapshot)
+
+    def test_post_refresh_replaces_snapshot(self):
+        self.client.get(reverse(self.url_name))
+        snapshot = PreFlourishReportSnapshot.objects.get()
+        response = self.client.post(reverse(self.url_name), {'refresh': 'yes'})
+        self.assertRedirects(response, reverse(self.url_name))
+        refreshed = PreFlourishReportSnapshot.objects.get()
+        self.assertNotEqual(refreshed.pk, snapshot.pk)
+        self.assertGreater(refreshed.snapshot_datetime, snapshot.snapshot_datetime)
+
+    def test_full_refresh_forced_when_due(self):
+        snapshot = CallsReports().refresh_snapshot()
+        incremental = CallsReports().refresh_snapshot()
+        self.assertEqual(
+            incremental.full_refresh_datetime, snapshot.full_refresh_datetime)
+
+        PreFlourishReportSnapshot.objects.update(
+            full_refresh_datetime=get_utcnow() - datetime.timedelta(days=2))
+        full = CallsReports().refresh_snapshot()
+        self.assertEqual(full.full_refresh_datetime, full.snapshot_datetime)
+
+
+@tag('calls_reports_eligibility')
+class TestEligibilityCounters(SyntheticCohortTestMixin, TestCase):
+
+    """Asserts the window function aggregate and the per participant
+    fallback give the same eligibility counters as the baseline loop.
+    """
+
+    cohort_size = 60
+    cohort_usernames = ['recruiter']
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Follow up two called participants with a later unsuccessful
+        # call, so their latest entry is not the successful one.
+        entries = []
+        for worklist in PreFlourishWorkList.objects.filter(is_called=True)[:2]:
+            entry = PreFlourishLogEntry.objects.filter(
+                study_maternal_identifier=worklist.study_maternal_identifier).latest(
+                    'call_datetime')
+            entries.append(PreFlourishLogEntry(
+                log_id=entry.log_id,
+                subject_identifier=entry.subject_identifier,
+                study_maternal_identifier=entry.study_maternal_identifier,
+                prev_study=entry.prev_study,
+                call_datetime=entry.call_datetime + datetime.timedelta(days=1),
+                phone_num_type=['subject_cell'],
+                phone_num_success=['none_of_the_above'],
+                cell_contact_fail='no_response',
+                has_child=NOT_APPLICABLE,
+                appt=NOT_APPLICABLE,
+                may_call=YES))
+        PreFlourishLogEntry.objects.bulk_create(entries)
+
+    def setUp(self):
+        super().setUp()
+        self.view = CallsReports()
+        self.baseline = self.view.eligibility_report_per_participant()
+
+    def fallback_counters(self):
+        with patch.object(connection.features, 'supports_over_clause', False):
+            return self.view.eligibility_counters(
+                self.view.eligibility_rows().values())
+
+    def test_baseline_counts(self):
+        self.assertEqual(self.baseline['eligible_pending_fu'], 2)
+        self.assertGreater(self.baseline['willing_to_schedule'], 0)
+
+    def test_aggregate_matches_baseline(self):
+        if not connection.features.supports_over_clause:
+            self.skipTest('The database backend has no window functions.')
+        self.assertEqual(self.view.eligibility_report_aggregate(), self.baseline)
+        self.assertEqual(
+            self.view.eligibility_counters(self.view.eligibility_rows().values()),
+            self.baseline)
+
+    def test_fallback_matches_baseline(self):
+        self.assertEqual(self.fallback_counters(), self.baseline)
+
+
+@tag('calls_reports_snapshot')
+class TestFlourishEligibility(TestCase):
+
+    """Asserts the flourish eligibility is read for all children in one
+    query once evaluated, and re-evaluated once stale.
+    """
+
+    child_identifiers = [f'B142-040990{idx:03d}-1-10' for idx in range(5)]
+
+    def setUp(self):
+        patcher = patch('pre_flourish_follow.views.calls_reports.is_flourish_eligible',
+                        return_value=(True, None))
+        self.is_flourish_eligible = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_stored_eligibility_one_query(self):
+        eligibility = CallsReports().flourish_eligibility(self.child_identifiers)
+        self.assertEqual(eligibility, dict.fromkeys(self.child_identifiers, True))
+        self.assertEqual(self.is_flourish_eligible.call_count, 5)
+
+        with self.assertNumQueries(1):
+            eligibility = CallsReports().flourish_eligibility(self.child_identifiers)
+        self.assertEqual(eligibility, dict.fromkeys(self.child_identifiers, True))
+        self.assertEqual(self.is_flourish_eligible.call_count, 5)
+
+    def test_stale_eligibility_reevaluated(self):
+        CallsReports().flourish_eligibility(self.child_identifiers)
+        PreFlourishChildEligibility.objects.filter(
+            subject_identifier=self.child_identifiers[0]).update(
+                evaluated_datetime=get_utcnow() - datetime.timedelta(days=2))
+        CallsReports().flourish_eligibility(self.child_identifiers)
+        self.assertEqual(self.is_flourish_eligible.call_count, 6)
+        self.assertEqual(PreFlourishChildEligibility.objects.count(), 5)
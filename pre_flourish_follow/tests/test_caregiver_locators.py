@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.test import TestCase, tag
+
+from ..caregiver_locators import latest_locators
+from ..synthetic_cohort import SyntheticCohort
+from .cohort_mixin import SyntheticCohortTestMixin
+
+
+@tag('caregiver_locators')
+class TestLatestLocators(SyntheticCohortTestMixin, TestCase):
+
+    cohort_size = 2
+
+    def setUp(self):
+        super().setUp()
+        latest_locators.clear()
+        self.addCleanup(latest_locators.clear)
+        self.locator_cls = django_apps.get_model('flourish_caregiver.caregiverlocator')
+        self.identifier = SyntheticCohort.identifier(0)
+
+    def test_callers_get_own_instances(self):
+        locator = latest_locators.get(self.identifier)
+        locator.subject_cell = '70000000'
+        with self.assertNumQueries(0):
+            cached = latest_locators.get(self.identifier)
+        self.assertIsNot(cached, locator)
+        self.assertEqual(cached.pk, locator.pk)
+        self.assertNotEqual(cached.subject_cell, '70000000')
+
+    def test_identifier_change_invalidates_previous(self):
+        previous = SyntheticCohort.identifier(1)
+        self.assertIsNotNone(latest_locators.get(previous))
+        self.assertIsNotNone(latest_locators.get(self.identifier))
+        self.locator_cls.objects.filter(study_maternal_identifier=self.identifier).delete()
+        self.assertIsNone(latest_locators.get(self.identifier))
+
+        locator = self.locator_cls.objects.get(study_maternal_identifier=previous)
+        locator.study_maternal_identifier = self.identifier
+        locator.save()
+        self.assertIsNone(latest_locators.get(previous))
+        self.assertEqual(latest_locators.get(self.identifier).pk, locator.pk)
+
+    def test_shared_cache_keeps_only_pk(self):
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with patch.object(app_config, 'locator_cache_alias', 'default'):
+            locator = latest_locators.get(self.identifier)
+            self.assertEqual(
+                cache.get(latest_locators.cache_key(self.identifier)), str(locator.pk))
+            latest_locators.clear()
+            with self.assertNumQueries(1):
+                cached = latest_locators.get(self.identifier)
+        self.assertEqual(cached.pk, locator.pk)
+
+    def test_subject_identifier_lookup(self):
+        locator = self.locator_cls.objects.get(study_maternal_identifier=self.identifier)
+        self.assertEqual(
+            latest_locators.get(locator.subject_identifier, field='subject_identifier').pk,
+            locator.pk)
+        locator.save()
+        self.assertNotIn(
+            ('subject_identifier', locator.subject_identifier), latest_locators._local)
@@ -0,0 +1,37 @@
+import datetime
+
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.test import RequestFactory, SimpleTestCase, tag
+
+from ..views.date_range_view_mixin import DateRangeViewMixin
+
+
+@tag('date_range')
+class TestDateRangeViewMixin(SimpleTestCase):
+
+    def setUp(self):
+        self.view = DateRangeViewMixin()
+        self.view.request = RequestFactory().get('/')
+        self.view.request._messages = CookieStorage(self.view.request)
+
+    def test_date_range_options(self):
+        self.assertEqual(
+            self.view.date_range_options(
+                'booking_date', start_date='2023-01-01', end_date='2023-01-31'),
+            {'booking_date__gte': datetime.date(2023, 1, 1),
+             'booking_date__lte': datetime.date(2023, 1, 31)})
+        self.assertEqual(list(get_messages(self.view.request)), [])
+
+    def test_malformed_dates_fall_back_to_default_range(self):
+        for start_date, end_date in [('not-a-date', '2023-01-31'),
+                                     ('2023-01-01', '2023-02-30'),
+                                     ('99999999999999999999', None)]:
+            with self.subTest(start_date=start_date, end_date=end_date):
+                self.assertEqual(
+                    self.view.date_range_options(
+                        'booking_date', start_date=start_date, end_date=end_date), {})
+                self.assertEqual(
+                    self.view.datetime_range_options(
+                        'appt_datetime', start_date=start_date, end_date=end_date), {})
+        self.assertEqual(len(list(get_messages(self.view.request))), 6)
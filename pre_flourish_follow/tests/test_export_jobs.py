@@ -0,0 +1,73 @@
+import datetime
+import time
+from unittest.mock import patch
+
+from django.apps import apps as django_apps
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, tag
+from django.urls import reverse
+from edc_base.utils import get_utcnow
+
+from ..export_jobs import heartbeat, requeue_stale_export_jobs, run_export_job
+from ..models import PreFlourishFollowExportFile as FollowExportFile
+
+
+@tag('export_jobs')
+class TestExportJobs(TestCase):
+
+    def create_export_file(self, identifier, **options):
+        return FollowExportFile.objects.create(
+            export_identifier=identifier, description='Test export', **options)
+
+    def test_requeue_stale_running_jobs(self):
+        stale = self.create_export_file(
+            'E1', status='running', report_type='participants_assignment',
+            heartbeat=get_utcnow() - datetime.timedelta(hours=1))
+        running = self.create_export_file(
+            'E2', status='running', report_type='participants_assignment',
+            heartbeat=get_utcnow())
+        self.assertEqual(requeue_stale_export_jobs(), 1)
+        stale.refresh_from_db()
+        running.refresh_from_db()
+        self.assertEqual(stale.status, 'pending')
+        self.assertEqual(running.status, 'running')
+
+    def test_unregistered_report_type_fails_with_short_error(self):
+        export_file = self.create_export_file(
+            'E3', status='pending', report_type='os.system',
+            export_params={'query': {}})
+        with self.assertLogs('pre_flourish_follow.export_jobs', level='ERROR'):
+            self.assertTrue(run_export_job(export_file.pk))
+        export_file.refresh_from_db()
+        self.assertEqual(export_file.status, 'failed')
+        self.assertEqual(export_file.error, 'The export failed (ValueError).')
+
+    def test_status_only_own_exports_unless_staff(self):
+        user = User.objects.create_user('recruiter', password='pass')
+        staff = User.objects.create_user('coordinator', password='pass', is_staff=True)
+        self.create_export_file('E4', status='done', user_created='recruiter')
+        self.create_export_file('E5', status='done', user_created='coordinator')
+        url = reverse('pre_flourish_follow:export_file_status_url')
+        query = {'identifier': ['E4', 'E5']}
+        for requester, expected in [(user, ['E4']), (staff, ['E4', 'E5'])]:
+            self.client.force_login(requester)
+            exports = self.client.get(url, query).json()['exports']
+            self.assertEqual(
+                sorted(export['export_identifier'] for export in exports), expected)
+
+
+@tag('export_jobs')
+class TestExportJobHeartbeat(TransactionTestCase):
+
+    def test_heartbeat_refreshed_while_building(self):
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        started = get_utcnow() - datetime.timedelta(hours=1)
+        export_file = FollowExportFile.objects.create(
+            export_identifier='E6', description='Test export', status='running',
+            report_type='participants_assignment', heartbeat=started)
+        with patch.object(app_config, 'export_job_heartbeat_interval', 0.05):
+            with heartbeat(export_file.pk):
+                time.sleep(0.3)
+        export_file.refresh_from_db()
+        self.assertGreater(export_file.heartbeat, started)
+        self.assertEqual(requeue_stale_export_jobs(), 0)
@@ -0,0 +1,34 @@
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+from django.test import TransactionTestCase, tag
+
+from ..models.signals import add_user_to_group, ensured_memberships
+
+
+@tag('group_memberships')
+class TestGroupMemberships(TransactionTestCase):
+
+    def setUp(self):
+        ensured_memberships.clear()
+        self.addCleanup(ensured_memberships.clear)
+        self.user = User.objects.create_user('recruiter')
+        self.group = Group.objects.create(name='Recruiters')
+
+    def test_membership_recorded_on_commit(self):
+        with transaction.atomic():
+            add_user_to_group('recruiter', 'Recruiters')
+            self.assertNotIn(('recruiter', 'Recruiters'), ensured_memberships)
+        self.assertIn(('recruiter', 'Recruiters'), ensured_memberships)
+
+    def test_membership_not_recorded_on_rollback(self):
+        try:
+            with transaction.atomic():
+                add_user_to_group('recruiter', 'Recruiters')
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertNotIn(('recruiter', 'Recruiters'), ensured_memberships)
+        self.assertFalse(self.group.user_set.exists())
+
+        add_user_to_group('recruiter', 'Recruiters')
+        self.assertTrue(self.group.user_set.filter(pk=self.user.pk).exists())
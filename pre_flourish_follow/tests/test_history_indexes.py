@@ -0,0 +1,87 @@
+import datetime
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, tag
+from edc_base.utils import get_utcnow
+
+from ..models import (PreFlourishBooking, PreFlourishCall, PreFlourishInPersonContactAttempt,
+                      PreFlourishInPersonLog, PreFlourishLog, PreFlourishLogEntry,
+                      PreFlourishWorkList)
+
+
+@tag('query_plans')
+@skipUnless(connection.vendor == 'postgresql', 'Query plans are postgresql specific.')
+class TestParticipantHistoryIndexes(TestCase):
+
+    """Asserts the per participant history lookups use the
+    study_maternal_identifier indexes as entries accumulate.
+    """
+
+    participants = 2000
+    entries = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        now = get_utcnow()
+        identifiers = [f'B{idx:06d}' for idx in range(cls.participants)]
+
+        calls = PreFlourishCall.objects.bulk_create([
+            PreFlourishCall(subject_identifier=idx) for idx in identifiers])
+        logs = PreFlourishLog.objects.bulk_create([
+            PreFlourishLog(call=call) for call in calls])
+        PreFlourishLogEntry.objects.bulk_create([
+            PreFlourishLogEntry(
+                log=log,
+                study_maternal_identifier=log.call.subject_identifier,
+                call_datetime=now - datetime.timedelta(days=entry))
+            for log in logs for entry in range(cls.entries)], batch_size=5000)
+
+        # Bulk created, the worklist post_save handler is not needed here.
+        worklist, = PreFlourishWorkList.objects.bulk_create([PreFlourishWorkList(
+            subject_identifier='B999999', study_maternal_identifier='B999999')])
+        in_person_log = PreFlourishInPersonLog.objects.create(
+            worklist=worklist,
+            study_maternal_identifier=worklist.study_maternal_identifier)
+        PreFlourishInPersonContactAttempt.objects.bulk_create([
+            PreFlourishInPersonContactAttempt(
+                in_person_log=in_person_log,
+                study_maternal_identifier=idx,
+                contact_date=now.date() - datetime.timedelta(days=entry))
+            for idx in identifiers for entry in range(cls.entries)], batch_size=5000)
+
+        PreFlourishBooking.objects.bulk_create([
+            PreFlourishBooking(
+                study_maternal_identifier=idx, first_name=idx, last_name=idx)
+            for idx in identifiers], batch_size=5000)
+
+        with connection.cursor() as cursor:
+            for model_cls in [PreFlourishLogEntry, PreFlourishInPersonContactAttempt,
+                              PreFlourishBooking]:
+                cursor.execute(f'ANALYZE {model_cls._meta.db_table}')
+
+    def assert_uses_index(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=plan)
+
+    def test_latest_log_entry(self):
+        self.assert_uses_index(
+            PreFlourishLogEntry.objects.filter(
+                study_maternal_identifier='B000100').order_by('-call_datetime')[:1],
+            'pf_logentry_smid_call_idx')
+
+    def test_log_entry_history(self):
+        self.assert_uses_index(
+            PreFlourishLogEntry.objects.filter(study_maternal_identifier='B000100'),
+            'pf_logentry_smid_call_idx')
+
+    def test_in_person_attempts(self):
+        self.assert_uses_index(
+            PreFlourishInPersonContactAttempt.objects.filter(
+                study_maternal_identifier='B000100').order_by('-contact_date'),
+            'pf_inperson_smid_date_idx')
+
+    def test_booking(self):
+        self.assert_uses_index(
+            PreFlourishBooking.objects.filter(study_maternal_identifier='B000100'),
+            'pf_booking_smid_idx')
@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.test import SimpleTestCase, tag
+
+HEAVY_MODULES = ['pandas', 'plotly', 'django_pandas', 'numpy']
+
+FLOURISH_INI = '''[edc_device]
+device_id = 99
+role = CentralServer
+'''
+
+IMPORT_VIEWS = '''
+import json, sys
+import django
+django.setup()
+before = set(sys.modules)
+import pre_flourish_follow.urls
+print(json.dumps(sorted(set(sys.modules) - before)))
+'''
+
+
+@tag('benchmark')
+class TestViewsImportTime(SimpleTestCase):
+
+    """Imports the url conf, and with it the views, in a fresh
+    interpreter, asserting the heavy data modules are imported lazily.
+    """
+
+    def import_views(self):
+        with tempfile.TemporaryDirectory() as etc_dir:
+            with open(os.path.join(etc_dir, 'flourish.ini'), 'w') as f:
+                f.write(FLOURISH_INI)
+            env = dict(
+                os.environ,
+                DJANGO_SETTINGS_MODULE='pre_flourish_follow.settings',
+                FLOURISH_ETC_DIR=etc_dir)
+            result = subprocess.run(
+                [sys.executable, '-c', IMPORT_VIEWS],
+                capture_output=True, text=True, env=env)
+        self.assertEqual(result.returncode, 0, msg=result.stderr[-2000:])
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_heavy_modules_not_imported(self):
+        loaded = [module for module in self.import_views()
+                  if module.split('.')[0] in HEAVY_MODULES]
+        self.assertEqual(loaded, [])
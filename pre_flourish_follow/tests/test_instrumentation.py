@@ -0,0 +1,100 @@
+import json
+from unittest.mock import patch
+
+from django.apps import apps as django_apps
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, tag
+
+from ..instrumentation import (InstrumentationMiddleware, current_profile, instrumented,
+                               profiling, section)
+
+
+class Counter:
+
+    @property
+    @instrumented
+    def users(self):
+        return User.objects.count()
+
+
+@tag('instrumentation')
+class TestInstrumentation(TestCase):
+
+    def test_sections_not_recorded_without_profile(self):
+        self.assertIsNone(current_profile())
+        with self.assertNumQueries(2):
+            with section('users'):
+                User.objects.count()
+            self.assertEqual(Counter().users, 0)
+
+    def test_sections_recorded(self):
+        with profiling(path='/pre_flourish_follow/') as profile:
+            with section('outer'):
+                Counter().users
+                Counter().users
+        self.assertIsNone(current_profile())
+        self.assertEqual(profile.queries, 2)
+        sections = {s['name']: s for s in profile.as_dict()['sections']}
+        self.assertEqual(sections['Counter.users']['calls'], 2)
+        self.assertEqual(sections['Counter.users']['queries'], 2)
+        self.assertEqual(sections['outer']['queries'], 2)
+        self.assertGreaterEqual(profile.wall_time, profile.sql_time)
+
+
+@tag('instrumentation')
+class TestInstrumentationMiddleware(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', is_staff=True)
+        cls.user = User.objects.create_user('user')
+
+    def setUp(self):
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        patcher = patch.object(app_config, 'instrumentation_enabled', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.middleware = InstrumentationMiddleware(self.get_response)
+
+    def get_response(self, request):
+        User.objects.count()
+        return HttpResponse()
+
+    def get_request(self, user):
+        request = RequestFactory().get('/pre_flourish_follow/')
+        request.user = user
+        return request
+
+    def test_not_used_when_disabled(self):
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        with patch.object(app_config, 'instrumentation_enabled', False):
+            with self.assertRaises(MiddlewareNotUsed):
+                InstrumentationMiddleware(self.get_response)
+
+    def test_footer_for_staff_only(self):
+        request = self.get_request(self.staff)
+        self.middleware(request)
+        self.assertEqual(request.instrumentation.queries, 1)
+        for user in [self.user, AnonymousUser()]:
+            request = self.get_request(user)
+            self.middleware(request)
+            self.assertFalse(hasattr(request, 'instrumentation'))
+
+    def test_footer_disabled(self):
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        with patch.object(app_config, 'instrumentation_footer', False):
+            middleware = InstrumentationMiddleware(self.get_response)
+        request = self.get_request(self.staff)
+        middleware(request)
+        self.assertFalse(hasattr(request, 'instrumentation'))
+
+    def test_logs_profile_as_json(self):
+        with self.assertLogs('pre_flourish_follow.instrumentation', 'INFO') as logs:
+            self.middleware(self.get_request(self.user))
+        self.assertEqual(len(logs.records), 1)
+        profile = json.loads(logs.records[0].getMessage())
+        self.assertEqual(profile['path'], '/pre_flourish_follow/')
+        self.assertEqual(profile['queries'], 1)
+        self.assertGreaterEqual(profile['wall_ms'], profile['sql_ms'])
@@ -0,0 +1,193 @@
+from django.apps import apps as django_apps
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from edc_base.utils import get_utcnow
+
+from ..caregiver_locators import latest_locators
+from ..models import (PreFlourishInPersonContactAttempt, PreFlourishInPersonLog,
+                      PreFlourishLogEntry, PreFlourishWorkList)
+from ..views import CallsReports
+from .cohort_mixin import SyntheticCohortTestMixin
+
+
+@tag('query_budgets')
+class TestQueryBudgets(SyntheticCohortTestMixin, TestCase):
+
+    """Renders each listboard, report and admin form, and refreshes the
+    calls reports snapshot, on a small and a larger dataset, asserting
+    the number of queries is the same for both and within budget.
+    """
+
+    budgets = {
+        'pre_flourish_follow:home_url': 25,
+        'pre_flourish_follow:calls_reports_url': 25,
+        'pre_flourish_follow:pre_flourish_follow_listboard_url': 30,
+        'pre_flourish_follow:pre_flourish_follow_appt_listboard_url': 20,
+        'pre_flourish_follow:pre_flourish_follow_book_listboard_url': 20,
+        'pre_flourish_follow:pre_flourish_follow_booking_listboard_url': 20,
+        'pre_flourish_follow_admin:pre_flourish_follow_preflourishlogentry_add': 20,
+        'pre_flourish_follow_admin:pre_flourish_follow_preflourishlogentry_change': 25,
+        'pre_flourish_follow_admin:pre_flourish_follow_preflourishinpersoncontactattempt_add': 20,
+        'pre_flourish_follow_admin:pre_flourish_follow_preflourishinpersoncontactattempt_change': 25,
+        'refresh_snapshot': 25,
+        'refresh_snapshot_incremental': 30,
+    }
+
+    # The small cohort renders less than a page of 10 rows, so a query
+    # per row shows as a difference with the large one.
+    small, large = 5, 60
+    cohort_usernames = ['recruiter']
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        cls.user = User.objects.create_superuser(
+            'recruiter', 'recruiter@example.com', 'pass',
+            first_name='Test', last_name='Recruiter')
+        for name in [app_config.assignable_users_group, 'Recruiters']:
+            Group.objects.get_or_create(name=name)[0].user_set.add(cls.user)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def seed(self, count):
+        """Grows the synthetic cohort, with the participants assigned to
+        the test user, to `count` participants and returns its first
+        log entry.
+        """
+        self.grow_cohort(count - self.cohort_end)
+        return PreFlourishLogEntry.objects.order_by('created', 'id').first()
+
+    def in_person_attempt(self):
+        """Returns the first in-person contact attempt, adding one for
+        the first participant if the cohort has none.
+        """
+        attempt = PreFlourishInPersonContactAttempt.objects.order_by('created', 'id').first()
+        if attempt:
+            return attempt
+        in_person_log = PreFlourishInPersonLog.objects.order_by('created', 'id').first()
+        return PreFlourishInPersonContactAttempt.objects.create(
+            in_person_log=in_person_log,
+            study_maternal_identifier=in_person_log.study_maternal_identifier,
+            contact_date=get_utcnow().date(),
+            contact_location=['physical_address'],
+            successful_location=['none_of_the_above'])
+
+    def count_queries(self, url):
+        cache.clear()
+        latest_locators.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertIn(response.status_code, [200, 302], msg=url)
+        return len(context.captured_queries)
+
+    def count_refresh_queries(self, full):
+        if not full:
+            # Re-evaluate every participant in the incremental refresh.
+            PreFlourishWorkList.objects.update(modified=get_utcnow())
+        with CaptureQueriesContext(connection) as context:
+            CallsReports().refresh_snapshot(full=full)
+        return len(context.captured_queries)
+
+    def assert_refresh_budget(self, name, full):
+        """Asserts the query count of refreshing the calls reports
+        snapshot does not grow from the small to the large dataset and
+        is within budget.
+        """
+        self.seed(self.small)
+        CallsReports().refresh_snapshot(full=True)
+        small = self.count_refresh_queries(full)
+        self.seed(self.large)
+        large = self.count_refresh_queries(full)
+        self.assertEqual(
+            small, large,
+            msg=f'{name} ran {small} queries for {self.small} participants '
+                f'and {large} for {self.large}.')
+        self.assertLessEqual(large, self.budgets[name], msg=name)
+
+    def assert_budget(self, url_name, get_url):
+        """Asserts the query count for the url does not grow from the
+        small to the large dataset and is within budget.
+        """
+        url = get_url(self.seed(self.small))
+        # Warm up once, e.g. the calls reports snapshot.
+        self.count_queries(url)
+        small = self.count_queries(url)
+        self.seed(self.large)
+        large = self.count_queries(url)
+        self.assertEqual(
+            small, large,
+            msg=f'{url_name} ran {small} queries for {self.small} participants '
+                f'and {large} for {self.large}.')
+        self.assertLessEqual(large, self.budgets[url_name], msg=url_name)
+
+    def test_home_view(self):
+        url_name = 'pre_flourish_follow:home_url'
+        self.assert_budget(url_name, lambda entry: reverse(url_name))
+
+    def test_calls_reports(self):
+        url_name = 'pre_flourish_follow:calls_reports_url'
+        self.assert_budget(url_name, lambda entry: reverse(url_name))
+
+    def test_worklist_listboard(self):
+        url_name = 'pre_flourish_follow:pre_flourish_follow_listboard_url'
+        self.assert_budget(url_name, lambda entry: reverse(url_name))
+
+    def test_appointment_listboard(self):
+        url_name = 'pre_flourish_follow:pre_flourish_follow_appt_listboard_url'
+        self.assert_budget(url_name, lambda entry: reverse(url_name))
+
+    def test_book_listboard(self):
+        url_name = 'pre_flourish_follow:pre_flourish_follow_book_listboard_url'
+        self.assert_budget(url_name, lambda entry: reverse(url_name))
+
+    def test_booking_listboard(self):
+        url_name = 'pre_flourish_follow:pre_flourish_follow_booking_listboard_url'
+        self.assert_budget(url_name, lambda entry: reverse(url_name))
+
+    def test_log_entry_add_form(self):
+        url_name = 'pre_flourish_follow_admin:pre_flourish_follow_preflourishlogentry_add'
+        self.assert_budget(
+            url_name,
+            lambda entry: (f'{reverse(url_name)}?log={entry.log_id}'
+                           f'&study_maternal_identifier={entry.study_maternal_identifier}'))
+
+    def test_log_entry_change_form(self):
+        url_name = 'pre_flourish_follow_admin:pre_flourish_follow_preflourishlogentry_change'
+        self.assert_budget(
+            url_name,
+            lambda entry: (f'{reverse(url_name, args=[entry.pk])}?log={entry.log_id}'
+                           f'&study_maternal_identifier={entry.study_maternal_identifier}'))
+
+    def test_in_person_attempt_add_form(self):
+        url_name = ('pre_flourish_follow_admin:'
+                    'pre_flourish_follow_preflourishinpersoncontactattempt_add')
+
+        def get_url(entry):
+            attempt = self.in_person_attempt()
+            return (f'{reverse(url_name)}?in_person_log={attempt.in_person_log_id}'
+                    f'&study_maternal_identifier={attempt.study_maternal_identifier}')
+        self.assert_budget(url_name, get_url)
+
+    def test_in_person_attempt_change_form(self):
+        url_name = ('pre_flourish_follow_admin:'
+                    'pre_flourish_follow_preflourishinpersoncontactattempt_change')
+
+        def get_url(entry):
+            attempt = self.in_person_attempt()
+            return (f'{reverse(url_name, args=[attempt.pk])}'
+                    f'?in_person_log={attempt.in_person_log_id}'
+                    f'&study_maternal_identifier={attempt.study_maternal_identifier}')
+        self.assert_budget(url_name, get_url)
+
+    def test_refresh_snapshot(self):
+        self.assert_refresh_budget('refresh_snapshot', full=True)
+
+    def test_refresh_snapshot_incremental(self):
+        self.assert_refresh_budget('refresh_snapshot_incremental', full=False)
@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase, tag
+from edc_base.utils import get_utcnow
+from edc_constants.constants import YES
+
+from ..synthetic_cohort import SyntheticCohort
+
+
+@tag('synthetic_cohort')
+class TestSyntheticCohort(SimpleTestCase):
+
+    def setUp(self):
+        self.now = get_utcnow()
+
+    def test_same_seed_same_participants(self):
+        cohort = SyntheticCohort(size=100, seed=1, reference_datetime=self.now)
+        other = SyntheticCohort(size=100, seed=1, reference_datetime=self.now)
+        self.assertEqual(
+            [cohort.participant(idx) for idx in range(100)],
+            [other.participant(idx) for idx in range(100)])
+
+    def test_default_reference_datetime_fixed(self):
+        cohort = SyntheticCohort(size=10, seed=1)
+        self.assertEqual(
+            cohort.reference_datetime, SyntheticCohort.default_reference_datetime)
+        self.assertEqual(
+            [cohort.participant(idx) for idx in range(10)],
+            [SyntheticCohort(size=10, seed=1).participant(idx) for idx in range(10)])
+
+    def test_participant_independent_of_start(self):
+        cohort = SyntheticCohort(size=10, seed=1, reference_datetime=self.now)
+        grown = SyntheticCohort(size=10, seed=1, start=50, reference_datetime=self.now)
+        self.assertEqual(cohort.participant(55), grown.participant(55))
+
+    def test_distributions(self):
+        cohort = SyntheticCohort(size=5000, seed=1, reference_datetime=self.now)
+        participants = [cohort.participant(idx) for idx in range(5000)]
+        assigned = [p for p in participants if p['assigned']]
+        self.assertAlmostEqual(len(assigned) / 5000, 0.6, delta=0.03)
+        for p in participants:
+            call_datetimes = [entry['call_datetime'] for entry in p['entries']]
+            self.assertEqual(len(call_datetimes), len(set(call_datetimes)))
+            if p['booking']:
+                self.assertTrue(p['is_called'])
+                self.assertEqual(p['booking']['appt'], YES)
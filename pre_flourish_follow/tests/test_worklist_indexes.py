@@ -0,0 +1,61 @@
+import os
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, tag
+
+from ..models import PreFlourishWorkList
+
+
+@tag('benchmark')
+@skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Set RUN_BENCHMARKS to run benchmarks.')
+@skipUnless(connection.vendor == 'postgresql', 'Partial indexes query plans.')
+class TestWorkListIndexes(TestCase):
+
+    """Benchmarks the worklist access paths on a synthetic 100k row
+    worklist, asserting the planner uses the worklist indexes.
+
+    Only runs with RUN_BENCHMARKS set, e.g.
+    `RUN_BENCHMARKS=1 python manage.py test --tag benchmark`.
+    """
+
+    rows = 100000
+    usernames = [f'user{idx}' for idx in range(50)]
+    prev_studies = ['Tshilo Dikotla', 'Mma Bana', 'Mpepu', 'Tshipidi']
+
+    @classmethod
+    def setUpTestData(cls):
+        worklists = []
+        for idx in range(cls.rows):
+            # One in twenty participants is still available.
+            available = idx % 20 == 0
+            worklists.append(PreFlourishWorkList(
+                subject_identifier=f'B{idx:06d}',
+                study_maternal_identifier=f'B{idx:06d}',
+                prev_study=cls.prev_studies[idx // 20 % len(cls.prev_studies)],
+                assigned=None if available else cls.usernames[idx % len(cls.usernames)],
+                is_called=idx % 50 == 1,
+                visited=idx % 70 == 1))
+        PreFlourishWorkList.objects.bulk_create(worklists, batch_size=5000)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {PreFlourishWorkList._meta.db_table}')
+
+    def assert_uses_index(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, msg=plan)
+
+    def test_available_count(self):
+        queryset = PreFlourishWorkList.objects.available(
+            prev_study='Mma Bana').values('id')
+        self.assert_uses_index(queryset, 'pf_worklist_available_idx')
+        self.assertEqual(queryset.count(), self.rows // 20 // len(self.prev_studies))
+
+    def test_user_listboard(self):
+        queryset = PreFlourishWorkList.objects.filter(
+            assigned='user7').order_by('-modified')[:10]
+        self.assert_uses_index(queryset, 'pf_worklist_assigned_idx')
+
+    def test_called_identifiers(self):
+        queryset = PreFlourishWorkList.objects.filter(
+            is_called=True).values_list('study_maternal_identifier', flat=True)
+        self.assert_uses_index(queryset, 'pf_worklist_called_idx')
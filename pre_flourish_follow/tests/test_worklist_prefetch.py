@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+
+from ..caregiver_locators import latest_locators
+from ..model_wrappers import WorkListModelWrapper, WorkListPrefetch
+from ..models import PreFlourishLogEntry, PreFlourishWorkList
+from .cohort_mixin import SyntheticCohortTestMixin
+
+
+@tag('worklist_prefetch')
+class TestWorkListPrefetch(SyntheticCohortTestMixin, TestCase):
+
+    """Wraps pages of worklist objects with WorkListPrefetch, asserting
+    the number of queries does not depend on the page size and the
+    wrappers give the same values as without it.
+    """
+
+    cohort_size = 20
+
+    def setUp(self):
+        super().setUp()
+        latest_locators.clear()
+        self.addCleanup(latest_locators.clear)
+
+    def page(self, size):
+        return list(PreFlourishWorkList.objects.order_by(
+            'study_maternal_identifier')[:size])
+
+    def values(self, wrapper):
+        subject_locator = wrapper.subject_locator
+        return (getattr(subject_locator, 'pk', None),
+                wrapper.call,
+                wrapper.call_log)
+
+    def prefetched_values(self, size):
+        """Returns the query count and values of a prefetched page.
+        """
+        latest_locators.clear()
+        with CaptureQueriesContext(connection) as context:
+            worklist_objs = self.page(size)
+            prefetch = WorkListPrefetch(worklist_objs=worklist_objs)
+            values = [
+                self.values(WorkListModelWrapper(
+                    obj, prefetched=prefetch.for_object(obj)))
+                for obj in worklist_objs]
+        return len(context.captured_queries), values
+
+    def test_queries_constant(self):
+        small, _ = self.prefetched_values(2)
+        large, _ = self.prefetched_values(self.cohort_size)
+        self.assertEqual(
+            small, large,
+            msg=f'{small} queries for 2 rows and {large} for {self.cohort_size}.')
+
+    def test_same_values_as_unprefetched(self):
+        _, prefetched = self.prefetched_values(10)
+        latest_locators.clear()
+        unprefetched = [self.values(WorkListModelWrapper(obj)) for obj in self.page(10)]
+        self.assertEqual(prefetched, unprefetched)
+
+    def test_log_entries_tied_call_datetime(self):
+        worklist_objs = self.page(10)
+        for obj in worklist_objs:
+            PreFlourishLogEntry.objects.filter(
+                log__call__subject_identifier=obj.subject_identifier).update(
+                    call_datetime=self.cohort_datetime)
+        prefetch = WorkListPrefetch(worklist_objs=worklist_objs)
+        for obj in worklist_objs:
+            prefetched = WorkListModelWrapper(obj, prefetched=prefetch.for_object(obj))
+            self.assertEqual(
+                [entry.object.pk for entry in prefetched.log_entries],
+                [entry.object.pk for entry in WorkListModelWrapper(obj).log_entries])
@@ -0,0 +1,95 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, tag
+from django.test.utils import CaptureQueriesContext
+
+from ..caregiver_locators import latest_locators
+from ..model_wrappers import WorkListModelWrapper, WorkListPrefetch
+from ..models import PreFlourishCall, PreFlourishLog, PreFlourishWorkList
+from .cohort_mixin import SyntheticCohortTestMixin
+
+
+@tag('wrapper_memoization')
+class TestWrapperMemoization(SyntheticCohortTestMixin, TestCase):
+
+    """Reads the memoized wrapper properties repeatedly for each
+    worklist row, asserting no query runs twice for a row.
+    """
+
+    cohort_size = 20
+
+    memoized = ['subject_locator', 'maternal_dataset', 'call', 'call_log',
+                'latest_call', 'latest_call_log', 'locator_phone_numbers',
+                'perform_home_visit', 'in_person_log']
+
+    def setUp(self):
+        super().setUp()
+        latest_locators.clear()
+        self.addCleanup(latest_locators.clear)
+
+    def assert_queries_once(self, queries, obj):
+        repeated = [sql for sql, count in Counter(
+            query['sql'] for query in queries).items() if count > 1]
+        self.assertEqual(
+            repeated, [], msg=f'Repeated for {obj.study_maternal_identifier}.')
+
+    def test_worklist_wrapper_queries_once_per_row(self):
+        for obj in PreFlourishWorkList.objects.all():
+            wrapper = WorkListModelWrapper(obj)
+            with CaptureQueriesContext(connection) as context:
+                for _ in range(3):
+                    for name in self.memoized:
+                        getattr(wrapper, name)
+                wrapper.home_visit_required
+                wrapper.prev_protocol
+                wrapper.log_entries
+                log_entry = wrapper.log_entry
+                log_entry.prev_study
+                log_entry.prev_study
+            self.assert_queries_once(context.captured_queries, obj)
+
+    def test_invalidate(self):
+        obj = PreFlourishWorkList.objects.first()
+        wrapper = WorkListModelWrapper(obj)
+        with self.assertNumQueries(2):
+            wrapper.call_log
+            wrapper.call_log
+        wrapper.invalidate('latest_call_log')
+        with self.assertNumQueries(1):
+            wrapper.call_log
+        wrapper.invalidate()
+        with self.assertNumQueries(2):
+            wrapper.call_log
+
+    def test_invalidate_clears_dependents(self):
+        obj = PreFlourishWorkList.objects.first()
+        wrapper = WorkListModelWrapper(obj)
+        previous_call, previous_log = wrapper.call, wrapper.call_log
+        call = PreFlourishCall.objects.create(
+            subject_identifier=obj.subject_identifier,
+            scheduled=wrapper.latest_call.scheduled + timedelta(days=1))
+        log = PreFlourishLog.objects.create(call=call)
+        self.assertEqual(
+            (wrapper.call, wrapper.call_log), (previous_call, previous_log))
+        wrapper.invalidate('latest_call')
+        self.assertEqual((wrapper.call, wrapper.call_log), (str(call.id), str(log.id)))
+        self.assertEqual(wrapper.latest_call_log, log)
+
+    def test_prefetched_clears_memoized(self):
+        obj = PreFlourishWorkList.objects.first()
+        wrapper = WorkListModelWrapper(obj)
+        wrapper.latest_call
+        wrapper.prefetched = dict(
+            WorkListPrefetch(worklist_objs=[obj]).for_object(obj), call=None)
+        self.assertIsNone(wrapper.latest_call)
+
+    def test_log_entry_without_prefetched_call_log(self):
+        obj = PreFlourishWorkList.objects.first()
+        prefetched = dict(
+            WorkListPrefetch(worklist_objs=[obj]).for_object(obj), call_log=None)
+        wrapper = WorkListModelWrapper(obj, prefetched=prefetched)
+        self.assertEqual(
+            wrapper.log_entry.object.log,
+            PreFlourishLog.objects.get(call=prefetched['call']))
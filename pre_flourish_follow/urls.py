@@ -4,7 +4,7 @@ from edc_dashboard import UrlConfig
 
 from .admin_site import pre_flourish_follow_admin
 from .views import (AppointmentListboardView, BookingListboardView, BookListboardView,
-                    CallsReports, HomeView, ListboardView)
+                    CallsReports, ExportFileStatusView, HomeView, ListboardView)
 
 app_name = 'pre_flourish_follow'
 
@@ -16,6 +16,8 @@ urlpatterns = [
     path('admin/', pre_flourish_follow_admin.urls),
     path('home', HomeView.as_view(), name='home_url'),
     path('calls_reports', CallsReports.as_view(), name='calls_reports_url'),
+    path('export_status', ExportFileStatusView.as_view(),
+         name='export_file_status_url'),
     path('', RedirectView.as_view(url='admin/'), name='admin_url'),
 ]
 
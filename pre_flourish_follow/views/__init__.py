@@ -3,5 +3,6 @@ from .book_listboard_view import BookListboardView
 from .booking_listboard_view import BookingListboardView
 from .calls_reports import CallsReports
 from .download_report_mixin import DownloadReportMixin
+from .export_file_status_view import ExportFileStatusView
 from .home_view import HomeView
 from .listboard import ListboardView
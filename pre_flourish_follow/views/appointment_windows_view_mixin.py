@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from django.db import NotSupportedError, models
+from django.db.models import Case, ExpressionWrapper, F, Func, Q, When
+from edc_visit_schedule import site_visit_schedules
+
+
+class AddMonths(Func):
+
+    """Adds calendar months, then a timedelta, to a datetime expression
+    the way relativedelta does, clamping to the end of shorter months.
+    """
+
+    output_field = models.DateTimeField()
+
+    def __init__(self, expression, months, delta=timedelta(), **extra):
+        self.months = months
+        self.delta = delta
+        super().__init__(expression, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            f'Month based visit windows are not supported on {connection.vendor}.')
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        return (f'({sql} + make_interval(months => %s, secs => %s))',
+                [*params, self.months, self.delta.total_seconds()])
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        return (f'DATE_ADD(DATE_ADD({sql}, INTERVAL %s MONTH), INTERVAL %s MICROSECOND)',
+                [*params, self.months, self.delta // timedelta(microseconds=1)])
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite rolls Jan 31 + 1 month over to Mar 3, so take the
+        # earlier of that and the last day of the target month.
+        sql, params = compiler.compile(self.source_expressions[0])
+        shifted = f"datetime({sql}, %s)"
+        month_end = (f"datetime({sql}, 'start of month', %s, '-1 days', "
+                     f"'+' || (strftime('%%s', {sql}) - strftime('%%s', date({sql}))) "
+                     f"|| ' seconds')")
+        return (f'datetime(min({shifted}, {month_end}), %s)',
+                [*params, f'{self.months:+d} months',
+                 *params, f'{self.months + 1:+d} months', *params, *params,
+                 f'{self.delta.total_seconds():+f} seconds'])
+
+
+class AppointmentWindowsViewMixin:
+
+    """Annotates appointments with their visit window, from the visit
+    schedule definitions, as `ideal_due_date`, `earliest_due_date` and
+    `latest_due_date`.
+
+    Declare with a view on edc_appointment.appointment.
+    """
+
+    _visit_windows = None
+
+    @classmethod
+    def visit_windows(cls):
+        """Returns a dict of the (lower, upper) window offsets per
+        (visit_schedule_name, schedule_name, visit_code), read once per
+        process.
+        """
+        if cls._visit_windows is None:
+            visit_windows = {}
+            for visit_schedule in site_visit_schedules.visit_schedules.values():
+                for schedule in visit_schedule.schedules.values():
+                    for visit in schedule.visits.values():
+                        visit_windows[(visit_schedule.name, schedule.name, visit.code)] = (
+                            cls.window_offset(visit.rlower),
+                            cls.window_offset(visit.rupper))
+            cls._visit_windows = visit_windows
+        return cls._visit_windows
+
+    @staticmethod
+    def window_offset(delta):
+        """Returns the window relativedelta as a (months, timedelta)
+        tuple, the months applied first as relativedelta does.
+        """
+        if isinstance(delta, timedelta):
+            return 0, delta
+        return (delta.years * 12 + delta.months,
+                timedelta(days=delta.days, hours=delta.hours, minutes=delta.minutes,
+                          seconds=delta.seconds, microseconds=delta.microseconds))
+
+    @staticmethod
+    def window_expression(window, sign):
+        months, delta = window
+        if months:
+            return AddMonths(F('timepoint_datetime'), sign * months, sign * delta)
+        return ExpressionWrapper(
+            F('timepoint_datetime') + sign * delta,
+            output_field=models.DateTimeField())
+
+    def window_case(self, bound, sign):
+        """Returns a Case over the visits grouped by window length, so
+        the number of Whens is the number of distinct windows.
+        """
+        visits_by_window = {}
+        for (visit_schedule_name, schedule_name, visit_code), windows in (
+                self.visit_windows().items()):
+            window = windows[bound]
+            visits_by_window.setdefault(window, Q())
+            visits_by_window[window] |= Q(
+                visit_schedule_name=visit_schedule_name,
+                schedule_name=schedule_name,
+                visit_code=visit_code)
+        return Case(
+            *[When(condition, then=self.window_expression(window, sign))
+              for window, condition in visits_by_window.items()],
+            default=None,
+            output_field=models.DateTimeField())
+
+    def annotate_windows(self, queryset):
+        return queryset.annotate(
+            ideal_due_date=F('timepoint_datetime'),
+            earliest_due_date=self.window_case(0, -1),
+            latest_due_date=self.window_case(1, 1))
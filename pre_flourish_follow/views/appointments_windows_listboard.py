@@ -1,8 +1,5 @@
-from requests import request
-import six
 import re
 from django.shortcuts import render
-import pandas as pd
 from datetime import datetime, timedelta
 from django.db import models
 from django.contrib import messages
@@ -22,6 +19,8 @@ from edc_navbar import NavbarViewMixin
 from edc_appointment.choices import NEW_APPT
 from edc_base.utils import get_utcnow
 
+from .appointment_windows_view_mixin import AppointmentWindowsViewMixin
+from .date_range_view_mixin import DateRangeViewMixin
 from .download_report_mixin import DownloadReportMixin
 from .filters import AppointmentListboardViewFilters
 from ..forms import AppointmentsWindowForm
@@ -32,6 +31,7 @@ from django.utils.text import slugify
 
 class AppointmentListboardView(NavbarViewMixin, EdcBaseViewMixin,
                                ListboardFilterViewMixin, SearchFormViewMixin,
+                               AppointmentWindowsViewMixin, DateRangeViewMixin,
                                DownloadReportMixin, ListboardView, FormMixin):
     form_class = AppointmentsWindowForm
     listboard_template = 'pre_flourish_follow_appt_listboard_template'
@@ -97,26 +97,47 @@ class AppointmentListboardView(NavbarViewMixin, EdcBaseViewMixin,
             q = Q(subject_identifier=search_term)
         return q
 
-    def export(self, appointment_wrappers=[], start_date=None, end_date=None):
-        """Export data.
+    def export(self, start_date=None, end_date=None):
+        """Queue the appointment windows export.
         """
-        data = []
-
-        for obj in appointment_wrappers:
-            # removed names, because it defies the protocol
-            data.append(
-                {'subject_identifier': getattr(obj, 'subject_identifier'),
-                 'earliest_date_due': getattr(obj, 'earliest_date_due'),
-                 'latest_date_due': getattr(obj, 'latest_date_due'),
-                 'ideal_date_due': getattr(obj, 'ideal_date_due'),
-                 'appt_datetime': getattr(obj, 'appt_datetime')})
-        df = pd.DataFrame(data)
-        self.download_data(
+        self.queue_export(
             description='Appointment and windows',
             start_date=start_date,
             end_date=end_date,
-            report_type='appointments_window_periods',
-            df=df)
+            report_type='appointments_window_periods')
+
+    # Export column per annotated queryset value, names removed per protocol.
+    export_columns = {
+        'subject_identifier': 'subject_identifier',
+        'earliest_date_due': 'earliest_due_date',
+        'latest_date_due': 'latest_due_date',
+        'ideal_date_due': 'ideal_due_date',
+        'appt_datetime': 'appt_datetime'}
+
+    export_chunk_size = 2000
+
+    export_session_keys = ['order_by']
+    export_view_attrs = ['start_date', 'end_date']
+
+    def build_export(self, doc, params, progress=None):
+        queryset = self.export_queryset(params)
+        self.write_export_rows(
+            doc, self.export_rows(queryset, progress=progress),
+            fieldnames=list(self.export_columns))
+
+    def export_rows(self, queryset, progress=None):
+        """Yields the export rows from the annotated queryset values,
+        read in chunks in a single pass, reporting the rows written per
+        chunk.
+        """
+        values = queryset.values(*self.export_columns.values()).iterator(
+            chunk_size=self.export_chunk_size)
+        for count, row in enumerate(values, start=1):
+            yield {column: 'N/A' if row[field] is None and column != 'appt_datetime'
+                   else row[field]
+                   for column, field in self.export_columns.items()}
+            if progress and count % self.export_chunk_size == 0:
+                progress(rows=count)
 
     def get_context_data(self, **kwargs):
 
@@ -124,11 +145,9 @@ class AppointmentListboardView(NavbarViewMixin, EdcBaseViewMixin,
         appointment_form = AppointmentsWindowForm()
 
         if self.request.GET.get('export') == 'yes':
-            queryset = self.get_queryset()  # from ListView
-            self.export(appointment_wrappers=list(
-                FollowAppointmentModelWrapper(model_obj=obj) for obj in self.get_queryset()))
+            self.export()
             msg = (
-                f'File generated successfully.  Go to the download list to download file.')
+                'File export started. Go to the download list to follow its progress.')
             messages.add_message(
                 self.request, messages.SUCCESS, msg)
         appointment_downloads = FollowExportFile.objects.filter(
@@ -206,12 +225,7 @@ class AppointmentListboardView(NavbarViewMixin, EdcBaseViewMixin,
 
     def get_queryset(self):
 
-        qs = self.modified_get_queryset().annotate(
-            ideal_due_date=F('timepoint_datetime'),
-            latest_due_date=ExpressionWrapper(
-                F('timepoint_datetime') + timedelta(days=44), output_field=models.DateTimeField()
-            ),
-        )
+        qs = self.annotate_windows(self.modified_get_queryset())
 
         sort_column = self.request.session.get('order_by', None)
 
@@ -228,11 +242,6 @@ class AppointmentListboardView(NavbarViewMixin, EdcBaseViewMixin,
             today = datetime.today() - timedelta(days=1)
             qs = qs.filter(latest_due_date__lte = today)
 
-        if self.start_date and not self.end_date:
-            qs = qs.filter(appt_datetime__date__gte=self.start_date)
-        elif not self.start_date and self.end_date:
-            qs = qs.filter(appt_datetime__date__lte=self.end_date)
-        elif self.start_date and self.end_date:
-            qs = qs.filter(appt_datetime__date__range=[
-                           self.start_date, self.end_date])
+        qs = qs.filter(**self.datetime_range_options(
+            'appt_datetime', start_date=self.start_date, end_date=self.end_date))
         return qs
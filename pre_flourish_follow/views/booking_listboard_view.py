@@ -1,6 +1,4 @@
-from datetime import timedelta
 from dateutil.parser import parse
-import datetime
 import re
 
 from django.contrib.auth.decorators import login_required
@@ -17,15 +15,16 @@ from edc_navbar import NavbarViewMixin
 
 from ..model_wrappers import BookingModelWrapper
 from ..forms import AppointmentRegistrationForm
+from .booking_stats_view_mixin import BookingStatsViewMixin
+from .date_range_view_mixin import DateRangeViewMixin
 from .filters import ScreeningListboardViewFilters
 from ..models import PreFlourishBooking
 from django.core.exceptions import ValidationError
-from edc_base.utils import get_utcnow
 
 
-class BookingListboardView(NavbarViewMixin, EdcBaseViewMixin,
-                               ListboardFilterViewMixin, SearchFormViewMixin,
-                               ListboardView, FormView):
+class BookingListboardView(BookingStatsViewMixin, DateRangeViewMixin, NavbarViewMixin,
+                           EdcBaseViewMixin, ListboardFilterViewMixin, SearchFormViewMixin,
+                           ListboardView, FormView):
 
     form_class = AppointmentRegistrationForm
     listboard_template = 'pre_flourish_follow_booking_listboard_template'
@@ -86,6 +85,7 @@ class BookingListboardView(NavbarViewMixin, EdcBaseViewMixin,
                 else:
                     booking.appt_status = status
                     booking.save()
+                    self.clear_booking_stats()
         if self.request.GET.get('status') == 'cancelled':
             subject_cell = self.request.GET.get('subject_cell')
             status = self.request.GET.get('status')
@@ -98,6 +98,7 @@ class BookingListboardView(NavbarViewMixin, EdcBaseViewMixin,
                 else:
                     booking.appt_status = status
                     booking.save()
+                    self.clear_booking_stats()
 
         self.object_list = self.get_queryset()
 
@@ -126,76 +127,15 @@ class BookingListboardView(NavbarViewMixin, EdcBaseViewMixin,
                     PreFlourishBooking.objects.get(subject_cell=subject_cell)
                 except PreFlourishBooking.DoesNotExist:
                     PreFlourishBooking.objects.create(**options)
-
-        booked_today = PreFlourishBooking.objects.filter(booking_date=get_utcnow().date()).count()
-        booked_today_done = PreFlourishBooking.objects.filter(
-            booking_date=get_utcnow().date(),
-            appt_status='done').count()
-        booked_today_pending = PreFlourishBooking.objects.filter(
-            booking_date=get_utcnow().date(),
-            appt_status='pending').count()
-        booked_today_cancelled = PreFlourishBooking.objects.filter(
-            booking_date=get_utcnow().date(),
-            appt_status='cancelled').count()
-
-        booked_tomorrow = PreFlourishBooking.objects.filter(booking_date=get_utcnow().date()).count()
-        booked_tomorrow_done = PreFlourishBooking.objects.filter(
-            booking_date=get_utcnow().date(),
-            appt_status='done').count()
-        booked_tomorrow_pending = PreFlourishBooking.objects.filter(
-            booking_date=get_utcnow().date(),
-            appt_status='pending').count()
-        booked_tomorrow_cancelled = PreFlourishBooking.objects.filter(
-            booking_date=get_utcnow().date() + timedelta(days=1),
-            appt_status='cancelled').count()
-
-        date = get_utcnow().date()
-        start_week = date - datetime.timedelta(date.weekday())
-        end_week = start_week + datetime.timedelta(6)
-        
-        booked_this_week = PreFlourishBooking.objects.filter(
-            booking_date__range=[start_week, end_week],).count()
-        booked_this_week_done = PreFlourishBooking.objects.filter(
-            booking_date__range=[start_week, end_week],
-            appt_status='done').count()
-        booked_this_week_pending = PreFlourishBooking.objects.filter(
-            booking_date__range=[start_week, end_week],
-            appt_status='pending').count()
-        booked_this_week_cancelled = PreFlourishBooking.objects.filter(
-            booking_date__range=[start_week, end_week],
-            appt_status='cancelled').count()
-            
-        done = PreFlourishBooking.objects.filter(
-            appt_status='done').count()
-        pending = PreFlourishBooking.objects.filter(
-            appt_status='pending').count()
-        cancelled = PreFlourishBooking.objects.filter(
-            appt_status='cancelled').count()
-        total_bookings = PreFlourishBooking.objects.all().count()
+                    self.clear_booking_stats()
 
         context = super().get_context_data(**kwargs)
-        context.update(
-            booked_this_week=booked_this_week,
-            booked_this_week_done=booked_this_week_done,
-            booked_this_week_pending=booked_this_week_pending,
-            booked_this_week_cancelled=booked_this_week_cancelled,
-            total_bookings=total_bookings,
-            done=done,
-            pending=pending,
-            cancelled=cancelled,
-            booked_today=booked_today,
-            booked_today_cancelled=booked_today_cancelled,
-            booked_tomorrow=booked_tomorrow,
-            booked_today_done=booked_today_done,
-            booked_today_pending=booked_today_pending,
-            booked_tomorrow_done=booked_tomorrow_done,
-            booked_tomorrow_pending=booked_tomorrow_pending,
-            booked_tomorrow_cancelled=booked_tomorrow_cancelled,)
+        context.update(**self.booking_stats)
         return context
 
     def get_queryset(self):
         qs = super().get_queryset()
-        if self.request.GET.get('start_date'):
-            qs = qs.filter(appt_datetime__date__gte=self.request.GET.get('start_date'),
-                           appt_datetime__date__lte=self.request.GET.get('end_date'))
-        return qs
+        return qs.filter(**self.date_range_options(
+            'booking_date',
+            start_date=self.request.GET.get('start_date'),
+            end_date=self.request.GET.get('end_date')))
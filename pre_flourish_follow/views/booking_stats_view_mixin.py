@@ -0,0 +1,53 @@
+import datetime
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from edc_base.utils import get_utcnow
+
+from ..models import PreFlourishBooking
+
+
+class BookingStatsViewMixin:
+
+    """Adds the booking dashboard counters, computed with a single
+    conditional aggregate and cached briefly.
+    """
+
+    booking_stats_cache_key = 'pre_flourish_follow_booking_stats'
+    booking_stats_cache_timeout = 30
+    booking_statuses = ['done', 'pending', 'cancelled']
+
+    @property
+    def booking_stats(self):
+        date = get_utcnow().date()
+        cache_key = f'{self.booking_stats_cache_key}_{date.isoformat()}'
+        booking_stats = cache.get(cache_key)
+        if booking_stats is None:
+            booking_stats = self.get_booking_stats(date)
+            cache.set(cache_key, booking_stats, self.booking_stats_cache_timeout)
+        return booking_stats
+
+    def clear_booking_stats(self):
+        cache.delete(
+            f'{self.booking_stats_cache_key}_{get_utcnow().date().isoformat()}')
+
+    def get_booking_stats(self, date):
+        """Returns the booking counters for today, tomorrow, this week and
+        overall, each per appointment status, in one query.
+        """
+        start_week = date - datetime.timedelta(date.weekday())
+        end_week = start_week + datetime.timedelta(6)
+        periods = {
+            'booked_today': Q(booking_date=date),
+            'booked_tomorrow': Q(booking_date=date + datetime.timedelta(days=1)),
+            'booked_this_week': Q(booking_date__range=[start_week, end_week])}
+
+        aggregates = {'total_bookings': Count('id')}
+        for status in self.booking_statuses:
+            aggregates[status] = Count('id', filter=Q(appt_status=status))
+        for name, period in periods.items():
+            aggregates[name] = Count('id', filter=period)
+            for status in self.booking_statuses:
+                aggregates[f'{name}_{status}'] = Count(
+                    'id', filter=period & Q(appt_status=status))
+        return PreFlourishBooking.objects.aggregate(**aggregates)
@@ -1,8 +1,14 @@
-import pandas as pd
 import pytz
-import plotly.express as px
-from plotly.offline import plot
 from django.apps import apps as django_apps
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Min, Q, Subquery, Window
+from django.db.models.functions import FirstValue
+from django.http import HttpResponseRedirect
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.views.generic import TemplateView
 from edc_base import get_utcnow
 from edc_base.view_mixins import EdcBaseViewMixin
@@ -11,10 +17,18 @@ from edc_navbar import NavbarViewMixin
 
 from pre_flourish.helper_classes.utils import is_flourish_eligible
 
+from .calls_reports_snapshot_mixin import CallsReportsSnapshotMixin
+from ..instrumentation import instrumented
+from ..lazy_import import LazyModule
+from ..models import PreFlourishChildEligibility
+
+pd = LazyModule('pandas')
+
 tz = pytz.timezone('Africa/Gaborone')
 
 
-class CallsReports(EdcBaseViewMixin, NavbarViewMixin, TemplateView):
+class CallsReports(CallsReportsSnapshotMixin, EdcBaseViewMixin,
+                   NavbarViewMixin, TemplateView):
     template_name = 'pre_flourish_follow/calls_reports.html'
     navbar_name = 'pre_flourish_follow'
     navbar_selected_item = 'calls_reports'
@@ -28,9 +42,6 @@ class CallsReports(EdcBaseViewMixin, NavbarViewMixin, TemplateView):
     flourish_consent_model = 'flourish_caregiver.caregiverchildconsent'
     contact_model = 'pre_flourish.preflourishcontact'
 
-    # Variable for Pre-flourish to Flourish enrolment report
-    pf_fl_enrolment = []
-
     @property
     def calls_model_cls(self):
         return django_apps.get_model(self.calls_model)
@@ -69,18 +80,32 @@ class CallsReports(EdcBaseViewMixin, NavbarViewMixin, TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+
+        # Serve the latest snapshot, refreshed on POST
+        snapshot = self.latest_snapshot or self.refresh_snapshot()
+
         context.update({
-            'contact_attempts': self.get_contact_attempts_data,
-            'eligibility_report': self.generate_eligibility_report,
-            'enrolment_report': self.generate_enrolment_report,
-            'pf_fl_enrolment_table': self.pf_fl_enrolment_df.to_html(
-                classes=['table', 'table-striped'],
-                table_id='pf_fl_enrolment_df',
-                border=0,
-                index=False)
+            'snapshot': snapshot,
+            'contact_attempts': snapshot.contact_attempts,
+            'eligibility_report': snapshot.eligibility_report,
+            'enrolment_report': snapshot.enrolment_report,
+            'pf_fl_enrolment_table': self.enrolment_table_df(
+                snapshot.enrolment_rows).to_html(
+                    classes=['table', 'table-striped'],
+                    table_id='pf_fl_enrolment_df',
+                    border=0,
+                    index=False)
         })
         return context
 
+    @method_decorator(login_required)
+    def post(self, request, *args, **kwargs):
+        if request.POST.get('refresh') == 'yes':
+            self.refresh_snapshot()
+            messages.add_message(
+                request, messages.SUCCESS, 'Calls reports refreshed successfully.')
+        return HttpResponseRedirect(reverse('pre_flourish_follow:calls_reports_url'))
+
     @property
     def get_contact_attempts_data(self):
         successful_calls = self.worklist_model_cls.objects.filter(
@@ -96,7 +121,77 @@ class CallsReports(EdcBaseViewMixin, NavbarViewMixin, TemplateView):
         return latest_obj
 
     @property
+    @instrumented
     def generate_eligibility_report(self):
+        """Returns the eligibility counters from the latest log entry
+        of each called participant.
+        """
+        if connection.features.supports_over_clause:
+            return self.eligibility_report_aggregate()
+        return self.eligibility_report_per_participant()
+
+    @property
+    def latest_called_log_entries(self):
+        """Returns a queryset of the latest log entry per called
+        study_maternal_identifier, resolved with a window function.
+        """
+        called_idxs = self.worklist_model_cls.objects.filter(
+            is_called=True).values('study_maternal_identifier')
+        latest_ids = self.log_entry_model_cls.objects.filter(
+            study_maternal_identifier__in=called_idxs).annotate(
+                latest_id=Window(
+                    expression=FirstValue('id'),
+                    partition_by=[F('study_maternal_identifier')],
+                    order_by=F('call_datetime').desc())).values('latest_id')
+        return self.log_entry_model_cls.objects.filter(id__in=Subquery(latest_ids))
+
+    def latest_log_entry_values(self, fields, study_maternal_identifiers=None):
+        """Returns the field values of the latest log entry per called
+        participant, optionally limited to the study maternal
+        identifiers, with a window function where the backend supports
+        one and a query per participant otherwise.
+        """
+        if connection.features.supports_over_clause:
+            latest = self.latest_called_log_entries
+            if study_maternal_identifiers is not None:
+                latest = latest.filter(
+                    study_maternal_identifier__in=study_maternal_identifiers)
+            return list(latest.values(*fields))
+        study_maternal_idxs = self.worklist_model_cls.objects.filter(
+            is_called=True).values_list('study_maternal_identifier', flat=True)
+        if study_maternal_identifiers is not None:
+            study_maternal_idxs = study_maternal_idxs.filter(
+                study_maternal_identifier__in=study_maternal_identifiers)
+        values = []
+        for study_idx in study_maternal_idxs:
+            model_obj = self.get_latest_model_obj(
+                self.log_entry_model_cls, 'study_maternal_identifier',
+                study_idx, 'call_datetime')
+            if model_obj:
+                values.append({field: getattr(model_obj, field) for field in fields})
+        return values
+
+    def eligibility_report_aggregate(self):
+        """Returns the eligibility counters in a single query using
+        conditional aggregation.
+        """
+        return self.latest_called_log_entries.aggregate(
+            eligible_with_child=Count('id', filter=Q(has_child=YES)),
+            eligible_pending_fu=Count('id', filter=Q(
+                phone_num_success__contains='none_of_the_above', may_call=YES)),
+            ineligible_no_child=Count('id', filter=Q(has_child=NO)),
+            willing_to_schedule=Count('id', filter=Q(appt=YES)),
+            not_willing_to_schedule=Count('id', filter=Q(appt=NO)),
+            still_thinking_to_schedule=Count('id', filter=Q(appt='thinking')),
+            screening_appointments=Count('id', filter=Q(appt_type='screening')),
+            recall_appointments=Count('id', filter=Q(appt_type='re_call')),
+            other_appointments=Count('id', filter=Q(appt_type=OTHER)),
+            scheduled_appt=Count('id', filter=Q(appt_date__gte=get_utcnow().date())))
+
+    def eligibility_report_per_participant(self):
+        """Returns the eligibility counters by fetching the latest log
+        entry of each participant, for backends without window functions.
+        """
         study_maternal_idxs = self.worklist_model_cls.objects.filter(
             is_called=True).values_list(
                 'study_maternal_identifier', flat=True)
@@ -155,60 +250,139 @@ class CallsReports(EdcBaseViewMixin, NavbarViewMixin, TemplateView):
         }
 
     @property
+    def child_consent_fk(self):
+        """Returns the FK field from the pre flourish child consent to
+        the caregiver consent.
+        """
+        return self.consent_model_cls.preflourishcaregiverchildconsent_set.field
+
+    @property
+    @instrumented
     def generate_enrolment_report(self):
+        """Returns the enrolment counters, pulling each dataset once
+        keyed by child subject_identifier and joining them in memory.
+        """
         screened = self.screening_model_cls.objects.count()
-        consents = self.consent_model_cls.objects.all()
-        child_consents_count = 0
-        fl_eligible = 0
-        fl_consented = 0
-        fl_scheduled_count = 0
-
-        for consent in consents:
-            child_consents = consent.preflourishcaregiverchildconsent_set.values_list(
-                'subject_identifier', flat=True)
-            child_consents = list(set(child_consents))
-            child_consents_count += len(child_consents)
-
-            for child_consent in child_consents:
-                fl_enrolment_dt = None
-                fl_scheduled_dt = None
-                pf_enrolment_dt = consent.preflourishcaregiverchildconsent_set.filter(
-                    subject_identifier=child_consent).earliest(
-                        'consent_datetime').consent_datetime.astimezone(tz).date()
-                eligible, _ = is_flourish_eligible(child_consent)
-                if eligible:
-                    fl_eligible += 1
-                fl_consent = self.flourish_consent_model_cls.objects.filter(
-                    study_child_identifier=child_consent)
-                if fl_consent.exists():
-                    fl_consented += 1
-                    fl_enrolment_dt = fl_consent.earliest(
-                        'consent_datetime').consent_datetime.astimezone(tz).date()
-
-                fl_enrol_scheduled = self.contact_model_cls.objects.filter(
-                    subject_identifier=child_consent,
-                    appt_date__gte=get_utcnow().date())
-                if fl_enrol_scheduled.exists():
-                    fl_scheduled_count += 1
-                    fl_scheduled_dt = fl_enrol_scheduled.latest(
-                        'appt_date').appt_date
-                self.pf_fl_enrolment.append(
-                    {'subject_identifier': child_consent,
-                     'pf_consent_dt': pf_enrolment_dt,
-                     'fl_consent_dt': fl_enrolment_dt,
-                     'fl_scheduled_dt': fl_scheduled_dt})
-
-        return {'screened': screened,
-                'consented': consents.count(),
-                'child_consents_count': child_consents_count,
-                'flourish_eligible': fl_eligible,
-                'fl_enrol_scheduled': fl_scheduled_count,
-                'flourish_consented': fl_consented}
+        consented = self.consent_model_cls.objects.count()
+
+        report = {'screened': screened, 'consented': consented}
+        report.update(self.enrolment_counters(self.enrolment_report_df))
+        return report
+
+    def enrolment_counters(self, report_df):
+        """Returns the child consent counters for an enrolment report
+        dataframe.
+        """
+        return {'child_consents_count': len(report_df),
+                'flourish_eligible': int(report_df['fl_eligible'].sum()),
+                'fl_enrol_scheduled': int(report_df['fl_scheduled_dt'].notnull().sum()),
+                'flourish_consented': int(report_df['fl_consent_dt'].notnull().sum())}
+
+    @cached_property
+    def enrolment_report_df(self):
+        """Returns a dataframe with a row per caregiver consent and
+        child, merging the pre flourish consent, flourish eligibility,
+        flourish consent and scheduled contact datasets.
+
+        Cached on the view instance, so it is built once per request.
+        """
+        return self.enrolment_report_frame()
+
+    def enrolment_report_frame(self, child_identifiers=None):
+        """Returns the enrolment report dataframe, limited to the
+        given child subject identifiers if any.
+        """
+        child_consent_fk = self.child_consent_fk
+        child_consents = child_consent_fk.model.objects.filter(
+            **{f'{child_consent_fk.name}__isnull': False})
+        if child_identifiers is not None:
+            child_consents = child_consents.filter(
+                subject_identifier__in=child_identifiers)
+        child_idxs = child_consents.values('subject_identifier')
+
+        pf_consents = pd.DataFrame.from_records(
+            child_consents.order_by().values(
+                child_consent_fk.attname, 'subject_identifier').annotate(
+                    pf_consent_dt=Min('consent_datetime')),
+            columns=[child_consent_fk.attname, 'subject_identifier', 'pf_consent_dt'])
+        pf_consents['pf_consent_dt'] = self.local_date(pf_consents['pf_consent_dt'])
+
+        eligibility = self.flourish_eligibility(
+            list(pf_consents['subject_identifier'].unique()))
+        pf_consents['fl_eligible'] = pf_consents['subject_identifier'].map(
+            eligibility).fillna(False).astype(bool)
+
+        fl_consents = pd.DataFrame.from_records(
+            self.flourish_consent_model_cls.objects.filter(
+                study_child_identifier__in=child_idxs).order_by().values(
+                    'study_child_identifier').annotate(
+                        fl_consent_dt=Min('consent_datetime')),
+            columns=['study_child_identifier', 'fl_consent_dt']).rename(
+                columns={'study_child_identifier': 'subject_identifier'})
+        fl_consents['fl_consent_dt'] = self.local_date(fl_consents['fl_consent_dt'])
+
+        fl_scheduled = pd.DataFrame.from_records(
+            self.contact_model_cls.objects.filter(
+                subject_identifier__in=child_idxs,
+                appt_date__gte=get_utcnow().date()).order_by().values(
+                    'subject_identifier').annotate(fl_scheduled_dt=Max('appt_date')),
+            columns=['subject_identifier', 'fl_scheduled_dt'])
+
+        report_df = pf_consents.merge(
+            fl_consents, on='subject_identifier', how='left').merge(
+                fl_scheduled, on='subject_identifier', how='left')
+        return report_df.astype(object).where(report_df.notnull(), None)
+
+    def flourish_eligibility(self, child_identifiers):
+        """Returns the flourish eligibility keyed by child subject
+        identifier, read from PreFlourishChildEligibility in one query.
+
+        Only children without a stored result, or with one older than
+        the app config's `calls_reports_full_refresh_interval`, are
+        evaluated with `is_flourish_eligible`, and their results stored.
+        """
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        evaluated_after = get_utcnow() - app_config.calls_reports_full_refresh_interval
+        eligibility = dict(PreFlourishChildEligibility.objects.filter(
+            subject_identifier__in=child_identifiers,
+            evaluated_datetime__gt=evaluated_after).values_list(
+                'subject_identifier', 'flourish_eligible'))
+        evaluated = {
+            child_idx: bool(is_flourish_eligible(child_idx)[0])
+            for child_idx in child_identifiers if child_idx not in eligibility}
+        if evaluated:
+            with transaction.atomic():
+                PreFlourishChildEligibility.objects.filter(
+                    subject_identifier__in=evaluated).delete()
+                PreFlourishChildEligibility.objects.bulk_create([
+                    PreFlourishChildEligibility(
+                        subject_identifier=child_idx, flourish_eligible=eligible)
+                    for child_idx, eligible in evaluated.items()])
+            eligibility.update(evaluated)
+        return eligibility
+
+    def local_date(self, series):
+        """Returns the dates in the local timezone for a series of
+        UTC datetimes.
+        """
+        return pd.to_datetime(series, utc=True).dt.tz_convert(tz).dt.date
+
+    @property
+    def pf_fl_enrolment(self):
+        """Returns the Pre-flourish to Flourish enrolment rows for
+        this request.
+        """
+        return self.enrolment_report_df[
+            ['subject_identifier', 'pf_consent_dt', 'fl_consent_dt',
+             'fl_scheduled_dt']].to_dict('records')
 
     @property
     def pf_fl_enrolment_df(self):
+        return self.enrolment_table_df(self.pf_fl_enrolment)
+
+    def enrolment_table_df(self, enrolment_rows):
         df = pd.DataFrame(
-            self.pf_fl_enrolment, columns=['subject_identifier', 'pf_consent_dt',
+            enrolment_rows, columns=['subject_identifier', 'pf_consent_dt',
                                            'fl_consent_dt', 'fl_scheduled_dt'])
         df['fl_consent_dt'] = pd.to_datetime(df['fl_consent_dt'])
         df['pf_consent_dt'] = pd.to_datetime(df['pf_consent_dt'])
@@ -0,0 +1,184 @@
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Q
+from edc_base.utils import get_utcnow
+from edc_constants.constants import NO, OTHER, YES
+
+from ..lazy_import import LazyModule
+from ..models import PreFlourishChildEligibility, PreFlourishReportSnapshot
+
+pd = LazyModule('pandas')
+
+
+class CallsReportsSnapshotMixin:
+
+    """Stores the calls reports in PreFlourishReportSnapshot and refreshes
+    them incrementally, re-evaluating only the participants changed since
+    the latest snapshot.
+
+    Deleted log entries are only picked up by a full refresh, which is
+    forced once the app config's `calls_reports_full_refresh_interval`
+    has passed since the last one. The stored flourish eligibility of
+    changed children is discarded, and a full refresh requested with
+    `full` re-evaluates it for all children.
+
+    Add to CallsReports.
+    """
+
+    snapshot_model_cls = PreFlourishReportSnapshot
+
+    eligibility_fields = [
+        'has_child', 'appt', 'appt_type', 'appt_date', 'phone_num_success',
+        'may_call']
+
+    enrolment_columns = [
+        'subject_identifier', 'pf_consent_dt', 'fl_consent_dt',
+        'fl_scheduled_dt', 'fl_eligible']
+
+    @property
+    def latest_snapshot(self):
+        try:
+            return self.snapshot_model_cls.objects.latest()
+        except self.snapshot_model_cls.DoesNotExist:
+            return None
+
+    def full_refresh_due(self, snapshot):
+        app_config = django_apps.get_app_config('pre_flourish_follow')
+        return (not snapshot.full_refresh_datetime
+                or get_utcnow() - snapshot.full_refresh_datetime
+                >= app_config.calls_reports_full_refresh_interval)
+
+    def refresh_snapshot(self, full=False):
+        """Replaces the snapshot with one refreshed from the latest, or
+        from scratch if `full`, due or no snapshot exists, and returns
+        it.
+        """
+        previous = self.latest_snapshot
+        if full:
+            PreFlourishChildEligibility.objects.all().delete()
+        if previous and (full or self.full_refresh_due(previous)):
+            previous = None
+        snapshot_datetime = get_utcnow()
+        full_refresh_datetime = (
+            previous.full_refresh_datetime if previous else snapshot_datetime)
+
+        if previous:
+            since = previous.snapshot_datetime
+            eligibility_rows = dict(previous.eligibility_rows)
+            eligibility_rows.update(
+                self.eligibility_rows(self.changed_study_maternal_identifiers(since)))
+            called_idxs = set(self.worklist_model_cls.objects.filter(
+                is_called=True).values_list('study_maternal_identifier', flat=True))
+            eligibility_rows = {
+                idx: row for idx, row in eligibility_rows.items()
+                if idx in called_idxs and row}
+
+            changed_children = self.changed_child_identifiers(since)
+            PreFlourishChildEligibility.objects.filter(
+                subject_identifier__in=changed_children).delete()
+            enrolment_rows = [
+                row for row in previous.enrolment_rows
+                if row['subject_identifier'] not in changed_children]
+            enrolment_rows += self.enrolment_rows(child_identifiers=changed_children)
+        else:
+            eligibility_rows = self.eligibility_rows()
+            enrolment_rows = self.enrolment_rows()
+
+        enrolment_rows = self.expire_scheduled(enrolment_rows)
+        enrolment_report = {
+            'screened': self.screening_model_cls.objects.count(),
+            'consented': self.consent_model_cls.objects.count()}
+        enrolment_report.update(self.enrolment_counters(
+            pd.DataFrame(enrolment_rows, columns=self.enrolment_columns)))
+
+        with transaction.atomic():
+            snapshot = self.snapshot_model_cls.objects.create(
+                snapshot_datetime=snapshot_datetime,
+                full_refresh_datetime=full_refresh_datetime,
+                contact_attempts=self.get_contact_attempts_data,
+                eligibility_report=self.eligibility_counters(eligibility_rows.values()),
+                enrolment_report=enrolment_report,
+                eligibility_rows=eligibility_rows,
+                enrolment_rows=enrolment_rows)
+            self.snapshot_model_cls.objects.exclude(pk=snapshot.pk).delete()
+        return snapshot
+
+    def changed_study_maternal_identifiers(self, since):
+        """Returns the study maternal identifiers with a log entry or
+        worklist record modified since `since`.
+        """
+        changed = set(self.log_entry_model_cls.objects.filter(
+            modified__gt=since).values_list('study_maternal_identifier', flat=True))
+        changed.update(self.worklist_model_cls.objects.filter(
+            modified__gt=since).values_list('study_maternal_identifier', flat=True))
+        return changed
+
+    def changed_child_identifiers(self, since):
+        """Returns the child subject identifiers with a pre flourish
+        consent, flourish consent or contact modified since `since`.
+        """
+        child_consent_fk = self.child_consent_fk
+        changed = set(child_consent_fk.model.objects.filter(
+            Q(modified__gt=since)
+            | Q(**{f'{child_consent_fk.name}__modified__gt': since})).values_list(
+                'subject_identifier', flat=True))
+        changed.update(self.flourish_consent_model_cls.objects.filter(
+            modified__gt=since).values_list('study_child_identifier', flat=True))
+        changed.update(self.contact_model_cls.objects.filter(
+            modified__gt=since).values_list('subject_identifier', flat=True))
+        return changed
+
+    def eligibility_rows(self, study_maternal_identifiers=None):
+        """Returns the latest log entry values per called participant,
+        keyed by study maternal identifier. Participants without a log
+        entry map to None.
+        """
+        rows = {}
+        if study_maternal_identifiers is not None:
+            rows = dict.fromkeys(study_maternal_identifiers)
+        for values in self.latest_log_entry_values(
+                ['study_maternal_identifier', *self.eligibility_fields],
+                study_maternal_identifiers=study_maternal_identifiers):
+            rows[values.pop('study_maternal_identifier')] = dict(
+                values, phone_num_success=list(values['phone_num_success'] or []))
+        return rows
+
+    def eligibility_counters(self, rows):
+        """Returns the eligibility report counters for the stored latest
+        log entry values.
+        """
+        today = get_utcnow().date().isoformat()
+        counters = dict.fromkeys([
+            'eligible_with_child', 'eligible_pending_fu', 'ineligible_no_child',
+            'willing_to_schedule', 'not_willing_to_schedule',
+            'still_thinking_to_schedule', 'screening_appointments',
+            'recall_appointments', 'other_appointments', 'scheduled_appt'], 0)
+        for row in rows:
+            appt_date = row.get('appt_date')
+            counters['eligible_with_child'] += row.get('has_child') == YES
+            counters['eligible_pending_fu'] += (
+                'none_of_the_above' in row.get('phone_num_success')
+                and row.get('may_call') == YES)
+            counters['ineligible_no_child'] += row.get('has_child') == NO
+            counters['willing_to_schedule'] += row.get('appt') == YES
+            counters['not_willing_to_schedule'] += row.get('appt') == NO
+            counters['still_thinking_to_schedule'] += row.get('appt') == 'thinking'
+            counters['screening_appointments'] += row.get('appt_type') == 'screening'
+            counters['recall_appointments'] += row.get('appt_type') == 're_call'
+            counters['other_appointments'] += row.get('appt_type') == OTHER
+            counters['scheduled_appt'] += bool(appt_date and str(appt_date) >= today)
+        return counters
+
+    def enrolment_rows(self, child_identifiers=None):
+        report_df = self.enrolment_report_frame(child_identifiers=child_identifiers)
+        return report_df[self.enrolment_columns].to_dict('records')
+
+    def expire_scheduled(self, enrolment_rows):
+        """Clears flourish scheduled dates that are now in the past, these
+        are re-read only when the contact is modified.
+        """
+        today = get_utcnow().date().isoformat()
+        for row in enrolment_rows:
+            if row['fl_scheduled_dt'] and str(row['fl_scheduled_dt']) < today:
+                row['fl_scheduled_dt'] = None
+        return enrolment_rows
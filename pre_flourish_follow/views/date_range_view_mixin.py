@@ -0,0 +1,64 @@
+import datetime
+
+from dateutil.parser import parse
+from django.contrib import messages
+from django.utils import timezone
+
+
+class DateRangeViewMixin:
+
+    """Builds index friendly date range filter options, comparing the
+    column itself rather than its DATE() cast.
+    """
+
+    @staticmethod
+    def as_date(value):
+        if not value:
+            return None
+        if isinstance(value, datetime.datetime):
+            return value.date()
+        if isinstance(value, datetime.date):
+            return value
+        return parse(value).date()
+
+    def date_range(self, start_date=None, end_date=None):
+        """Returns the start and end dates, or the default unbounded
+        range with a warning message if either is not a valid date.
+        """
+        try:
+            return self.as_date(start_date), self.as_date(end_date)
+        except (ValueError, OverflowError):
+            request = getattr(self, 'request', None)
+            if request is not None:
+                messages.add_message(
+                    request, messages.WARNING,
+                    f'Invalid date range {start_date or ""} to {end_date or ""}, '
+                    'showing all dates.', fail_silently=True)
+            return None, None
+
+    def datetime_range_options(self, field, start_date=None, end_date=None):
+        """Returns the half-open range [start_date 00:00, end_date + 1 day
+        00:00) in the site timezone as filter options on a datetime field.
+        """
+        tz = timezone.get_current_timezone()
+        options = {}
+        start_date, end_date = self.date_range(start_date, end_date)
+        if start_date:
+            options[f'{field}__gte'] = timezone.make_aware(
+                datetime.datetime.combine(start_date, datetime.time.min), tz)
+        if end_date:
+            options[f'{field}__lt'] = timezone.make_aware(
+                datetime.datetime.combine(
+                    end_date + datetime.timedelta(days=1), datetime.time.min), tz)
+        return options
+
+    def date_range_options(self, field, start_date=None, end_date=None):
+        """Returns the inclusive range as filter options on a date field.
+        """
+        options = {}
+        start_date, end_date = self.date_range(start_date, end_date)
+        if start_date:
+            options[f'{field}__gte'] = start_date
+        if end_date:
+            options[f'{field}__lte'] = end_date
+        return options
@@ -1,13 +1,71 @@
+import csv
 import os
 
 from django.conf import settings
+from django.http import HttpRequest, QueryDict
 
+from ..export_jobs import submit_export_job
 from ..identifiers import ExportIdentifier
 from ..models import PreFlourishFollowExportFile as FollowExportFile
 
 
 class DownloadReportMixin:
 
+    """Queues and writes report exports. Views registered for a report
+    type in `export_jobs.export_views` implement
+    `build_export(doc, params, progress=None)`, there is no default.
+    """
+
+    # Session keys and view attributes the export queryset depends on,
+    # stored with the job next to the request's query parameters.
+    export_session_keys = []
+    export_view_attrs = []
+
+    def queue_export(self, description=None, start_date=None, end_date=None,
+                     report_type=None):
+        """Records an export job with the request's parameters and
+        returns it, the file is built by the view registered for the
+        report type in `export_jobs.export_views`.
+        """
+        doc = FollowExportFile.objects.create(
+            description=description,
+            export_identifier=ExportIdentifier().identifier,
+            start_date=start_date,
+            end_date=end_date,
+            report_type=report_type,
+            status='pending',
+            export_params=self.export_params(),
+            user_created=self.request.user.username)
+        submit_export_job(doc.pk)
+        return doc
+
+    def export_params(self):
+        """Returns the JSON parameters `export_queryset` rebuilds the
+        export queryset from.
+        """
+        return {
+            'query': dict(self.request.GET.lists()),
+            'session': {key: self.request.session.get(key)
+                        for key in self.export_session_keys},
+            'attrs': {attr: getattr(self, attr, None)
+                      for attr in self.export_view_attrs},
+            'kwargs': self.kwargs}
+
+    def export_queryset(self, params):
+        """Returns the view's queryset for the stored export parameters,
+        as it was when the export was queued.
+        """
+        request = HttpRequest()
+        request.method = 'GET'
+        request.GET = QueryDict(mutable=True)
+        for key, values in params.get('query', {}).items():
+            request.GET.setlist(key, values)
+        request.session = dict(params.get('session', {}))
+        self.setup(request, **params.get('kwargs', {}))
+        for attr, value in params.get('attrs', {}).items():
+            setattr(self, attr, value)
+        return self.get_queryset()
+
     def download_data(self, description=None, start_date=None,
                       end_date=None, report_type=None, df=None):
         """Export all data.
@@ -19,21 +77,48 @@ class DownloadReportMixin:
             'description': description,
             'export_identifier': export_identifier,
             'start_date': start_date,
-            'end_date': end_date
+            'end_date': end_date,
+            'report_type': report_type,
+            'user_created': self.request.user.username
         }
         doc = FollowExportFile.objects.create(**options)
+        self.write_export(doc, df)
 
+    def write_export(self, doc, df):
+        """Writes the data frame to the export file's document.
+        """
+        final_path, export_path = self.export_paths(doc)
+        df.to_csv(export_path, encoding='utf-8', index=False)
+        self.export_done(doc, final_path)
+
+    def write_export_rows(self, doc, rows, fieldnames):
+        """Writes the rows, dicts keyed by `fieldnames`, to the export
+        file's document as they are read.
+        """
+        final_path, export_path = self.export_paths(doc)
+        with open(export_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        self.export_done(doc, final_path)
+
+    def export_paths(self, doc):
+        """Returns the document path and the export path on disk.
+        """
         # Document path
         upload_to = FollowExportFile.document.field.upload_to
-        fname = export_identifier + '.csv'
-        final_path = upload_to + report_type + '/' + fname
+        fname = doc.export_identifier + '.csv'
+        final_path = upload_to + doc.report_type + '/' + fname
 
         # Export path
-        export_path = settings.MEDIA_ROOT + '/documents/' + report_type + '/'
+        export_path = settings.MEDIA_ROOT + '/documents/' + doc.report_type + '/'
         if not os.path.exists(export_path):
             os.makedirs(export_path)
         export_path += fname
-        df.to_csv(export_path, encoding='utf-8', index=False)
+        return final_path, export_path
 
+    def export_done(self, doc, final_path):
         doc.document = final_path
+        doc.status = 'done'
+        doc.progress = 100
         doc.save()
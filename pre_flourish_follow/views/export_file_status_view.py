@@ -0,0 +1,34 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views.generic.base import View
+
+from ..models import PreFlourishFollowExportFile as FollowExportFile
+
+
+class ExportFileStatusView(View):
+
+    """Returns the status of the requested export jobs, polled by the
+    download lists while exports are running. Users other than staff
+    only see their own exports.
+    """
+
+    def get(self, request, *args, **kwargs):
+        export_files = FollowExportFile.objects.filter(
+            export_identifier__in=request.GET.getlist('identifier'))
+        if not request.user.is_staff:
+            export_files = export_files.filter(user_created=request.user.username)
+        exports = [
+            {'export_identifier': export_file.export_identifier,
+             'status': export_file.status,
+             'status_display': export_file.get_status_display(),
+             'progress': export_file.progress,
+             'progress_display': export_file.progress_display,
+             'error': export_file.error,
+             'file_url': export_file.file_url if export_file.document else None}
+            for export_file in export_files]
+        return JsonResponse({'exports': exports})
+
+    @method_decorator(login_required)
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
@@ -1,6 +1,4 @@
 import datetime
-from decimal import Decimal
-import random
 
 from django.apps import apps as django_apps
 from django.contrib import messages
@@ -15,9 +13,6 @@ from django.views.generic.edit import FormView
 from edc_base.view_mixins import EdcBaseViewMixin
 from edc_navbar import NavbarViewMixin
 
-from django_pandas.io import read_frame
-from flourish_child.models import ChildDataset
-
 from ..forms import (
     AssignParticipantForm, ResetAssignmentForm, ReAssignParticipantForm,
     SingleReAssignParticipantForm)
@@ -26,6 +21,9 @@ from ..models import PreFlourishWorkList as WorkList
 from .filters import AssignmentsViewFilters
 
 from .download_report_mixin import DownloadReportMixin
+from ..lazy_import import LazyModule
+
+django_pandas_io = LazyModule('django_pandas.io')
 
 
 class HomeView(
@@ -39,20 +37,20 @@ class HomeView(
 
     view_filters = AssignmentsViewFilters()
 
+    # Assignments do not exclude children over the age limit.
+    exclude_over_age_limit = False
+
     def get_success_url(self):
         return reverse('pre_flourish_follow:home_url')
 
     def create_user_worklist(self, username=None, selected_participants=None):
         """Sets a work list for a user.
         """
-        for participant in selected_participants:
-            update_values = {
-                'assigned': username,
-                'date_assigned': timezone.now().date(),
-                'user_modified': self.request.user.username}
-            WorkList.objects.update_or_create(
-                study_maternal_identifier=participant,
-                defaults=update_values)
+        WorkList.objects.assign_participants(
+            study_maternal_identifiers=selected_participants,
+            username=username,
+            user_modified=self.request.user.username,
+            exclude_over_age_limit=self.exclude_over_age_limit)
 
     @property
     def participants_assignments(self):
@@ -62,33 +60,10 @@ class HomeView(
                 'assigned', 'study_maternal_identifier', 'is_called', 'visited')
         return assignments
 
-    @property
-    def over_age_limit(self):
-        """Return the list of 17 years 9 months children.
-        """
-        over_age_limit = ChildDataset.objects.filter(
-            age_today__gte=Decimal('17.9')).values_list(
-                'study_maternal_identifier', flat=True)
-        return list()
-
     def available_participants(self, prev_study=None):
-
-        if prev_study:
-            identifiers = WorkList.objects.filter(
-                prev_study=prev_study, consented=False,
-                is_called=False, assigned=None, date_assigned=None).values_list(
-                    'study_maternal_identifier', flat=True)
-        else:
-            identifiers = WorkList.objects.filter(
-                is_called=False,
-                assigned=None,
-                date_assigned=None,
-                consented=False,).values_list(
-                    'study_maternal_identifier', flat=True)
-
-        final_list = list(set(identifiers) - set(self.over_age_limit))
-
-        return final_list
+        return WorkList.objects.available(
+            prev_study=prev_study,
+            exclude_over_age_limit=self.exclude_over_age_limit)
 
     def reset_participant_assignments(self, username=None):
         """Resets all assignments if reset is yes.
@@ -158,35 +133,37 @@ class HomeView(
         return super().form_valid(form)
 
     def get_participants(self, participants, username, ratio=None, prev_study=None):
-
-        available_participants = self.available_participants(prev_study=prev_study)
-
-        if (len(available_participants) < participants):
-            selected_participants = self.available_participants(prev_study=prev_study)
-        else:
-            if ratio:
-                selected_participants = random.sample(
-                    available_participants, round(participants * ratio))
-            else:
-                selected_participants = random.sample(
-                    available_participants, participants)
-
-        self.create_user_worklist(username=username,
-                                  selected_participants=selected_participants)
+        """Claims a random sample of available participants for the
+        user, selected and locked in the database.
+        """
+        count = round(participants * ratio) if ratio else participants
+        if self.available_participants(prev_study=prev_study).count() < participants:
+            count = None
+
+        selected_participants = WorkList.objects.claim_participants(
+            count=count,
+            username=username,
+            prev_study=prev_study,
+            user_modified=self.request.user.username,
+            exclude_over_age_limit=self.exclude_over_age_limit)
         return len(selected_participants)
 
     def export(self):
-        """Export data.
+        """Queue the participants assignments export.
         """
-        qs = WorkList.objects.filter(assigned__isnull=False)
-        df = read_frame(qs, fieldnames=[
-            'assigned', 'study_maternal_identifier', 'is_called', 'visited'])
-        self.download_data(
+        self.queue_export(
             description='Participants Assignments',
             start_date=datetime.datetime.now().date(),
             end_date=datetime.datetime.now().date(),
-            report_type='participants_assignment',
-            df=df)
+            report_type='participants_assignment')
+
+    def build_export(self, doc, params, progress=None):
+        """Writes the participants assignments export for the queued
+        job, its queryset does not depend on the request.
+        """
+        queryset = WorkList.objects.filter(assigned__isnull=False)
+        self.write_export(doc, django_pandas_io.read_frame(queryset, fieldnames=[
+            'assigned', 'study_maternal_identifier', 'is_called', 'visited']))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -197,8 +174,8 @@ class HomeView(
         if self.request.GET.get('assignments_export') == 'yes':
             self.export()
             msg = (
-                f'Participants file generated succesfully. '
-                'Go to the download list to download file.')
+                'Participants file export started. '
+                'Go to the download list to follow its progress.')
             messages.add_message(
                 self.request, messages.SUCCESS, msg)
         assignments_downloads = FollowExportFile.objects.filter(
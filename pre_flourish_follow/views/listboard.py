@@ -1,11 +1,8 @@
-from decimal import Decimal
-import random
 import re
 
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
 from django.urls.base import reverse
-from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.generic.edit import FormView
 from edc_base.view_mixins import EdcBaseViewMixin
@@ -14,10 +11,9 @@ from edc_navbar import NavbarViewMixin
 from edc_dashboard.view_mixins import (
     ListboardFilterViewMixin, SearchFormViewMixin)
 from edc_dashboard.views import ListboardView
-from flourish_child.models import ChildDataset
 
 from ..forms import ParticipantsNumberForm
-from ..model_wrappers import WorkListModelWrapper
+from ..model_wrappers import WorkListModelWrapper, WorkListPrefetch
 from ..models import PreFlourishWorkList as WorkList
 from .filters import WorkListboardViewFilters
 from .worklist_queryset_view_mixin import WorkListQuerysetViewMixin
@@ -50,13 +46,10 @@ class ListboardView(NavbarViewMixin, EdcBaseViewMixin,
     def create_user_worklist(self, selected_participants=None):
         """Sets a work list for a user.
         """
-        for participant in selected_participants:
-            update_values = {
-                'assigned': self.request.user.username,
-                'date_assigned': timezone.now().date()}
-            WorkList.objects.update_or_create(
-                study_maternal_identifier=participant,
-                defaults=update_values)
+        WorkList.objects.assign_participants(
+            study_maternal_identifiers=selected_participants,
+            username=self.request.user.username,
+            user_modified=self.request.user.username)
 
     def form_valid(self, form):
         # This method is called when valid form data has been POSTed.
@@ -69,25 +62,36 @@ class ListboardView(NavbarViewMixin, EdcBaseViewMixin,
         return super().form_valid(form)
 
     def get_participants(self, participants, ratio=None, prev_study=None):
-
-        available_participants = self.available_participants(prev_study=prev_study)
-
-        if not available_participants:
-            available_participants = self.available_participants()
-
-        if (len(available_participants) < participants):
-            selected_participants = self.available_participants(prev_study=prev_study)
-        else:
-            selected_participants = random.sample(
-                    available_participants, participants)
-
-        self.create_user_worklist(selected_participants=selected_participants)
+        """Claims a random sample of available participants for the
+        user, selected and locked in the database.
+        """
+        if not self.available_participants(prev_study=prev_study).exists():
+            prev_study = None
+
+        count = participants
+        if self.available_participants(prev_study=prev_study).count() < participants:
+            count = None
+
+        selected_participants = WorkList.objects.claim_participants(
+            count=count,
+            username=self.request.user.username,
+            prev_study=prev_study,
+            user_modified=self.request.user.username)
         return len(selected_participants)
 
     @method_decorator(login_required)
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
 
+    def get_wrapped_queryset(self, queryset):
+        """Returns the wrapped page with the related rows for all
+        objects on the page loaded in bulk.
+        """
+        worklist_objs = list(queryset)
+        prefetch = WorkListPrefetch(worklist_objs=worklist_objs)
+        return [self.model_wrapper_cls(obj, prefetched=prefetch.for_object(obj))
+                for obj in worklist_objs]
+
     def get_queryset_filter_options(self, request, *args, **kwargs):
         options = super().get_queryset_filter_options(request, *args, **kwargs)
         if kwargs.get('subject_identifier'):
@@ -101,33 +105,8 @@ class ListboardView(NavbarViewMixin, EdcBaseViewMixin,
             q = Q(first_name__exact=search_term)
         return q
 
-    @property
-    def over_age_limit(self):
-        """Return the list of 17 years 9 months children.
-        """
-        over_age_limit = ChildDataset.objects.filter(
-            age_today__gte=Decimal('17.9')).values_list(
-                'study_maternal_identifier', flat=True)
-        return list(set(over_age_limit))
-
     def available_participants(self, prev_study=None):
-
-        if prev_study:
-            identifiers = WorkList.objects.filter(
-                prev_study=prev_study, consented=False,
-                is_called=False, assigned=None, date_assigned=None).values_list(
-                    'study_maternal_identifier', flat=True)
-        else:
-            identifiers = WorkList.objects.filter(
-                is_called=False,
-                assigned=None,
-                date_assigned=None,
-                consented=False).values_list(
-                    'study_maternal_identifier', flat=True)
-
-        final_list = list(set(identifiers) - set(self.over_age_limit))
-
-        return final_list
+        return WorkList.objects.available(prev_study=prev_study)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -135,6 +114,6 @@ class ListboardView(NavbarViewMixin, EdcBaseViewMixin,
             total_results=self.get_queryset().count(),
             called_subject=WorkList.objects.filter(is_called=True).count(),
             visited_subjects=WorkList.objects.filter(visited=True).count(),
-            total_available=len(self.available_participants()),
+            total_available=self.available_participants().count(),
         )
         return context
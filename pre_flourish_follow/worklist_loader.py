@@ -0,0 +1,158 @@
+import socket
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from edc_base.utils import get_utcnow
+from edc_search.search_slug import SearchSlug
+
+from .models import (PreFlourishCall, PreFlourishInPersonLog, PreFlourishLog,
+                     PreFlourishWorkList)
+from .models.signals import add_users_to_assignable_group
+
+
+class WorkListLoader:
+
+    """Loads new participants into the worklist with bulk inserts,
+    bypassing the per row post_save handlers, call scheduling and
+    search slug computation.
+
+    The first new participant is saved normally and the call and log
+    scheduled for it are used as the template for the bulk created
+    calls and logs of the others.
+    """
+
+    # Scheduling fields shared by every new call and log, copied from the
+    # template's. Per subject fields such as the log's locator information
+    # are left to their defaults.
+    call_fields = ['label', 'scheduled', 'repeats', 'call_status', 'site']
+    log_fields = ['log_datetime']
+
+    def __init__(self, username=None, batch_size=1000, dry_run=False, progress=None):
+        self.username = username or ''
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.progress = progress
+        self.template = None
+        self.template_call = None
+        self.template_log = None
+
+    @staticmethod
+    def maternal_dataset_rows():
+        maternal_dataset_cls = django_apps.get_model(
+            'flourish_caregiver.maternaldataset')
+        for study_maternal_identifier, protocol in maternal_dataset_cls.objects.values_list(
+                'study_maternal_identifier', 'protocol').iterator():
+            yield {'study_maternal_identifier': study_maternal_identifier,
+                   'prev_study': protocol}
+
+    def load(self, rows):
+        """Loads the rows, dicts of study_maternal_identifier, prev_study
+        and optionally subject_identifier, skipping participants already
+        on the worklist. Returns the number of participants loaded.
+        """
+        loaded = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                loaded += self.load_batch(batch)
+                batch = []
+        if batch:
+            loaded += self.load_batch(batch)
+        return loaded
+
+    def load_batch(self, rows):
+        rows = {row['study_maternal_identifier']: row for row in rows
+                if row.get('study_maternal_identifier')}
+        existing = set(PreFlourishWorkList.objects.filter(
+            study_maternal_identifier__in=rows).values_list(
+                'study_maternal_identifier', flat=True))
+        rows = [row for idx, row in rows.items() if idx not in existing]
+        loaded = len(rows)
+        if rows and not self.dry_run:
+            with transaction.atomic():
+                if not self.template:
+                    self.create_template(rows.pop(0))
+                worklists = self.create_worklists(rows)
+                self.create_in_person_logs(worklists)
+                self.create_calls(worklists)
+        if self.progress:
+            self.progress(loaded, len(existing))
+        return loaded
+
+    def create_template(self, row):
+        self.template = PreFlourishWorkList.objects.create(
+            subject_identifier=row.get('subject_identifier') or None,
+            study_maternal_identifier=row['study_maternal_identifier'],
+            prev_study=row.get('prev_study') or '',
+            user_created=self.username)
+        self.template_call = PreFlourishCall.objects.filter(
+            subject_identifier=self.template.subject_identifier).order_by(
+                'created').first()
+        if self.template_call:
+            self.template_log = PreFlourishLog.objects.filter(
+                call=self.template_call).order_by('created').first()
+
+    def audit_fields(self):
+        now = get_utcnow()
+        hostname = socket.gethostname()[:60]
+        return dict(created=now, modified=now, user_created=self.username,
+                    hostname_created=hostname, hostname_modified=hostname)
+
+    def create_worklists(self, rows):
+        over_age = set(PreFlourishWorkList.objects.over_age_identifiers(
+            [row['study_maternal_identifier'] for row in rows]).values_list(
+                'study_maternal_identifier', flat=True))
+        worklists = []
+        for row in rows:
+            worklist = PreFlourishWorkList(
+                subject_identifier=(
+                    row.get('subject_identifier') or row['study_maternal_identifier']),
+                study_maternal_identifier=row['study_maternal_identifier'],
+                prev_study=row.get('prev_study') or '',
+                over_age_limit=row['study_maternal_identifier'] in over_age,
+                site_id=self.template.site_id,
+                **self.audit_fields())
+            worklist.slug = SearchSlug(
+                obj=worklist, fields=worklist.get_search_slug_fields()).slug
+            worklists.append(worklist)
+        return PreFlourishWorkList.objects.bulk_create(worklists)
+
+    def create_in_person_logs(self, worklists):
+        PreFlourishInPersonLog.objects.bulk_create([
+            PreFlourishInPersonLog(
+                worklist=worklist,
+                study_maternal_identifier=worklist.study_maternal_identifier,
+                **self.audit_fields())
+            for worklist in worklists])
+
+    def copy_values(self, obj, field_names):
+        """Returns the values of the named fields the object's model
+        has, keyed by attname.
+        """
+        return {
+            field.attname: getattr(obj, field.attname)
+            for field in obj._meta.concrete_fields if field.name in field_names}
+
+    def create_calls(self, worklists):
+        if not self.template_call:
+            return
+        call_values = self.copy_values(self.template_call, self.call_fields)
+        calls = PreFlourishCall.objects.bulk_create([
+            PreFlourishCall(
+                subject_identifier=worklist.subject_identifier,
+                **call_values, **self.audit_fields())
+            for worklist in worklists])
+        if self.template_log:
+            log_values = self.copy_values(self.template_log, self.log_fields)
+            PreFlourishLog.objects.bulk_create([
+                PreFlourishLog(call=call, **log_values, **self.audit_fields())
+                for call in calls])
+
+    def finish(self):
+        """Runs the once per load side effects of worklist_on_post_save.
+        """
+        if self.template and not self.dry_run:
+            if self.username:
+                add_users_to_assignable_group([self.username])
+            PreFlourishWorkList.objects.refresh_over_age_limit()